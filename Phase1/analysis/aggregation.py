@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+SUPPORTED_STATS = ("count", "sum", "sumsq", "min", "max", "mean", "median")
+
+def _normalize_stats(value_stats):
+    # Accept the same {column: stat or [stats]} form as DataFrame.agg
+    return {column: [stats] if isinstance(stats, str) else list(stats) for column, stats in value_stats.items()}
+
+def aggregate_breakdowns(df, breakdowns):
+    """Compute several groupby(...).agg(...) tables in a single pass over the data.
+
+    `breakdowns` maps a table name to (key column, {value column: stat or [stats]}), for example
+    {"Bedrooms": ("Bedrooms", {"Sale Price": ["mean", "median", "count"]})}. Every key is factorized
+    once and every value column is converted once; each (key, value column) pair is then summed and
+    counted with a few bincount calls over those shared arrays, and medians reuse a single sort of
+    each value column. The returned tables match DataFrame.groupby(key).agg(...) with sorted keys.
+    """
+    breakdowns = {name: (key, _normalize_stats(value_stats)) for name, (key, value_stats) in breakdowns.items()}
+    for _, value_stats in breakdowns.values():
+        for stats in value_stats.values():
+            unknown = set(stats) - set(SUPPORTED_STATS)
+            if unknown:
+                raise ValueError(f"Unsupported statistics: {sorted(unknown)}")
+
+    # Factorize every key once; rows with a missing key go to a trailing bin that is dropped, as groupby does
+    keys = list(dict.fromkeys(key for key, _ in breakdowns.values()))
+    codes, uniques, sizes = {}, {}, {}
+    for key in keys:
+        key_codes, uniques[key] = pd.factorize(df[key], sort=True)
+        num_groups = len(uniques[key])
+        # The narrowest unsigned dtype lets numpy's stable sort of the codes run as a radix sort
+        codes[key] = np.where(key_codes >= 0, key_codes, num_groups).astype(np.min_scalar_type(num_groups))
+        sizes[key] = np.bincount(codes[key], minlength=num_groups + 1)
+
+    value_columns = list(dict.fromkeys(column for _, value_stats in breakdowns.values() for column in value_stats))
+    results = {}
+    for column in value_columns:
+        values = df[column].to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        has_missing = not valid.all()
+        # Summing deviations from the column mean keeps the group sums' rounding error small,
+        # without a second pass over the residuals
+        if has_missing:
+            shift = values[valid].mean() if valid.any() else 0.0
+            deviations = np.where(valid, values - shift, 0.0)
+        else:
+            shift = values.mean() if len(values) else 0.0
+            deviations = values - shift
+        requested = {stat for _, value_stats in breakdowns.values() for stat in value_stats.get(column, [])}
+        if "median" in requested:
+            # Sorted once per column and shared by the medians of every key (ties need no stable order)
+            value_order = np.argsort(values)
+            sorted_values = values[value_order]
+        results[column] = {}
+        for key in dict.fromkeys(key for key, value_stats in breakdowns.values() if column in value_stats):
+            key_codes, num_groups = codes[key], len(uniques[key])
+            deviation_sums = np.bincount(key_codes, weights=deviations, minlength=num_groups + 1)[:num_groups]
+            if has_missing:
+                counts = np.bincount(key_codes[valid], minlength=num_groups + 1)[:num_groups]
+            else:
+                counts = sizes[key][:num_groups]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                key_results = {"count": counts, "sum": deviation_sums + shift * counts,
+                               "mean": shift + deviation_sums / counts}
+            if "sumsq" in requested:
+                clean = np.where(valid, values, 0.0)
+                key_results["sumsq"] = np.bincount(key_codes, weights=clean ** 2, minlength=num_groups + 1)[:num_groups]
+            if "min" in requested or "max" in requested:
+                # fmin/fmax skip missing values, which stay NaN
+                key_results["min"] = np.full(num_groups + 1, np.nan)
+                key_results["max"] = np.full(num_groups + 1, np.nan)
+                np.fmin.at(key_results["min"], key_codes, values)
+                np.fmax.at(key_results["max"], key_codes, values)
+                key_results["min"], key_results["max"] = key_results["min"][:num_groups], key_results["max"][:num_groups]
+            if "median" in requested:
+                key_results["median"] = _grouped_medians(sorted_values, key_codes[value_order], sizes[key], counts)
+            results[column][key] = key_results
+
+    tables = {}
+    for name, (key, value_stats) in breakdowns.items():
+        columns = {(column, stat): results[column][key][stat] for column, stats in value_stats.items() for stat in stats}
+        tables[name] = pd.DataFrame(columns, index=pd.Index(uniques[key], name=key))
+    return tables
+
+def _grouped_medians(sorted_values, sorted_codes, group_sizes, counts):
+    # A stable (radix) sort of the group codes taken in value order leaves every group as a
+    # contiguous, ascending run of its values (missing values sort last and are not counted)
+    group_order = np.argsort(sorted_codes, kind="stable")
+    starts = np.cumsum(group_sizes) - group_sizes
+    medians = np.full(len(counts), np.nan)
+    has_values = counts > 0
+    lower = group_order[starts[:len(counts)][has_values] + (counts[has_values] - 1) // 2]
+    upper = group_order[starts[:len(counts)][has_values] + counts[has_values] // 2]
+    medians[has_values] = (sorted_values[lower] + sorted_values[upper]) / 2
+    return medians
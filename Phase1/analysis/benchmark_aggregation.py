@@ -0,0 +1,44 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"))
+from generate_dataset import create_dataset_bulk
+from aggregation import aggregate_breakdowns
+from home_sales_analysis import BREAKDOWNS
+from time_index import SalesTimeIndex
+
+# The per-table groupby passes aggregate_breakdowns replaces
+def groupby_breakdowns(df, breakdowns):
+    return {name: df.groupby(key).agg(value_stats) for name, (key, value_stats) in breakdowns.items()}
+
+# Compare the single-pass engine against one groupby().agg per table on generated sales
+def benchmark(aggregate, df, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        tables = aggregate(df, BREAKDOWNS)
+        best = min(best, time.perf_counter() - start)
+    return best, tables
+
+def same_tables(expected, actual):
+    return all(np.allclose(expected[name][column].to_numpy(dtype=float), actual[name][column].to_numpy(dtype=float),
+                           rtol=1e-12, equal_nan=True)
+               for name in expected for column in expected[name].columns)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark aggregate_breakdowns against per-table groupby().agg")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 2000000])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'Rows':>10}  {'groupby (s)':>12}  {'engine (s)':>11}  {'Speedup':>8}  Same tables")
+    for size in args.sizes:
+        df = SalesTimeIndex(create_dataset_bulk(size)).with_date_parts()
+        groupby_time, expected = benchmark(groupby_breakdowns, df, args.repeats)
+        engine_time, actual = benchmark(aggregate_breakdowns, df, args.repeats)
+        print(f"{size:>10,}  {groupby_time:>12.3f}  {engine_time:>11.3f}  {groupby_time / engine_time:>7.1f}x  "
+              f"{same_tables(expected, actual)}")
@@ -0,0 +1,78 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_REPLICATES = 2000
+# Larger datasets are bootstrapped on a random subset of this many rows (see bootstrap_contrasts)
+DEFAULT_MAX_ROWS = 20000
+
+# Cells of the (replicates x rows) weight matrix built at once; bounds memory on large datasets
+BATCH_CELLS = 1 << 22
+
+def _replicate_means(values, masks, replicates, seed):
+    """Group means of `replicates` bootstrap resamples, shape (replicates, groups)"""
+    rng = np.random.default_rng(seed)
+    n = len(values)
+    # One row of resampled indexes per replicate, turned into how often each row was drawn
+    indexes = rng.integers(0, n, size=(replicates, n))
+    offsets = (np.arange(replicates) * n)[:, None]
+    weights = np.bincount((indexes + offsets).ravel(), minlength=replicates * n).reshape(replicates, n)
+    weights = weights.astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (weights @ (masks * values).T) / (weights @ masks.T)
+
+def _contrast_estimates(values, masks, scales):
+    # Masks hold the k "from" groups, then the k "to" groups
+    k = len(scales)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return ((masks[k:] @ values) / masks[k:].sum(axis=1) - (masks[:k] @ values) / masks[:k].sum(axis=1)) * scales
+
+def bootstrap_contrasts(values, contrasts, replicates=DEFAULT_REPLICATES, confidence=0.95, seed=42, workers=1,
+                        max_rows=DEFAULT_MAX_ROWS):
+    """Bootstrap confidence intervals for differences of group means.
+
+    `contrasts` maps a label to (from_mask, to_mask, scale); its statistic is
+    (mean of values[to_mask] - mean of values[from_mask]) * scale. Every contrast is evaluated on the
+    same resamples, all at once. Replicates are drawn in fixed-size batches with one child seed per
+    batch, so the result does not depend on `workers`. Returns a table with the point estimate,
+    the percentile interval and the bootstrap standard error of each contrast.
+
+    Above `max_rows` rows (0 or None: never), the resamples are drawn from a random subset of
+    `max_rows` rows instead of every row, so the cost stops growing with the data. The spread of
+    a mean shrinks as 1/sqrt(rows), so the subset's statistics are scaled by sqrt(max_rows / rows)
+    around the full-data estimate (an m-out-of-n bootstrap).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    labels = list(contrasts)
+    masks = np.vstack([np.asarray(contrasts[label][0], dtype=np.float64) for label in labels]
+                      + [np.asarray(contrasts[label][1], dtype=np.float64) for label in labels])
+    scales = np.array([contrasts[label][2] for label in labels], dtype=np.float64)
+    k = len(labels)
+
+    estimates = _contrast_estimates(values, masks, scales)
+    shrink = 1.0
+    if max_rows and len(values) > max_rows:
+        shrink = np.sqrt(max_rows / len(values))
+        rows = np.sort(np.random.default_rng(seed).choice(len(values), max_rows, replace=False))
+        values, masks = values[rows], masks[:, rows]
+        centres = _contrast_estimates(values, masks, scales)
+
+    batch_size = max(1, min(replicates, BATCH_CELLS // max(len(values), 1)))
+    batches = [min(batch_size, replicates - start) for start in range(0, replicates, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+    if workers == 1 or len(batches) == 1:
+        means = [_replicate_means(values, masks, size, batch_seed) for size, batch_seed in zip(batches, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            means = list(pool.map(_replicate_means, [values] * len(batches), [masks] * len(batches), batches, seeds))
+    means = np.vstack(means)
+
+    statistics = (means[:, k:] - means[:, :k]) * scales
+    if shrink != 1.0:
+        statistics = estimates + (statistics - centres) * shrink
+    tail = (1 - confidence) / 2 * 100
+    # Resamples that drew no row of one of the groups have no statistic and are left out
+    lower, upper = np.nanpercentile(statistics, [tail, 100 - tail], axis=0)
+    return pd.DataFrame({'estimate': estimates, 'lower': lower, 'upper': upper,
+                         'std error': np.nanstd(statistics, axis=0, ddof=1)}, index=labels)
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+# Features the price is regressed on, besides the property type and sale-date effects
+NUMERIC_FEATURES = ['Square Footage', 'Bedrooms', 'Bathrooms', 'Year Built', 'Has Pool', 'Has Garage', 'Garage Size']
+
+def sale_time(dates):
+    """Sale dates as fractional years (2022-07-02 -> about 2022.5), with the quarter of each sale.
+
+    Computed with datetime64 integer arithmetic instead of the .dt accessors, which dominate
+    the cost of scoring large frames.
+    """
+    days = pd.to_datetime(dates).to_numpy(dtype="datetime64[D]")
+    years = days.astype("datetime64[Y]")
+    day_of_year = (days - years.astype("datetime64[D]")).astype(np.float64)
+    quarters = days.astype("datetime64[M]").astype(np.int64) % 12 // 3 + 1
+    return years.astype(np.float64) + 1970 + day_of_year / 365.25, quarters
+
+class HedonicModel:
+    """Linear hedonic price model fitted with a single least-squares solve.
+
+    Sale Price is regressed on the numeric features, one indicator per property type (the first,
+    alphabetically, is the baseline) and sale-date effects: a linear time trend plus quarter
+    indicators (Q1 is the baseline). `predict` builds the design matrix for a whole frame at once,
+    so scoring is a single matrix-vector product.
+    """
+
+    def __init__(self):
+        self.property_types = None
+        self.reference_time = None
+        self.coefficients = None
+        self.r_squared = None
+        self.residual_std = None
+
+    def feature_names(self):
+        return (['Intercept'] + NUMERIC_FEATURES + ['Sale Time (years)']
+                + [f'Property Type: {name}' for name in self.property_types[1:]]
+                + [f'Quarter: Q{quarter}' for quarter in (2, 3, 4)])
+
+    def design_matrix(self, df):
+        n = len(df)
+        num_types = len(self.property_types)
+        # Column-major, so every feature is written to a contiguous column
+        X = np.zeros((n, 1 + len(NUMERIC_FEATURES) + 1 + (num_types - 1) + 3), order="F")
+        X[:, 0] = 1.0
+        for i, column in enumerate(NUMERIC_FEATURES, start=1):
+            X[:, i] = df[column].to_numpy(dtype=np.float64)
+        column = 1 + len(NUMERIC_FEATURES)
+
+        times, quarters = sale_time(df['Sale Date'])
+        X[:, column] = times - self.reference_time
+        column += 1
+
+        # Indicators from category codes; unseen property types fall back to the baseline type
+        codes = pd.Categorical(df['Property Type'], categories=self.property_types).codes
+        X[:, column:column + num_types - 1] = codes[:, None] == np.arange(1, num_types)
+        column += num_types - 1
+
+        X[:, column:column + 3] = quarters[:, None] == np.arange(2, 5)
+        return X
+
+    def fit(self, df):
+        self.property_types = sorted(df['Property Type'].astype(str).unique())
+        self.reference_time = pd.to_datetime(df['Sale Date']).dt.year.min()
+        X = self.design_matrix(df)
+        y = df['Sale Price'].to_numpy(dtype=np.float64)
+
+        # lstsq copes with rank-deficient designs (e.g. a quarter with no sales) by returning the minimum-norm fit
+        beta, _, _, _ = np.linalg.lstsq(X, y, rcond=None)
+        self.coefficients = pd.Series(beta, index=self.feature_names())
+
+        residuals = y - X @ beta
+        total = ((y - y.mean()) ** 2).sum()
+        self.r_squared = 1 - (residuals ** 2).sum() / total if total > 0 else np.nan
+        self.residual_std = np.sqrt((residuals ** 2).sum() / max(len(y) - X.shape[1], 1))
+        return self
+
+    def predict(self, df):
+        """Predicted sale price of every row of `df`"""
+        return self.design_matrix(df) @ self.coefficients.to_numpy()
+
+    def effect(self, df, before, after):
+        """Average change in predicted price when every home in `df` goes from `before` to `after` features"""
+        return (self.predict(df.assign(**after)) - self.predict(df.assign(**before))).mean()
@@ -1,266 +1,49 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
 import os
-
-# Set style for plots
-plt.style.use('ggplot')
-sns.set_palette("Set2")
-
-# Load the dataset
-data_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "pearl_city_home_sales.csv")
-df = pd.read_csv(data_path)
-
-# Convert Sale Date to datetime
-df['Sale Date'] = pd.to_datetime(df['Sale Date'])
-df['Month'] = df['Sale Date'].dt.month
-df['Year'] = df['Sale Date'].dt.year
-df['Quarter'] = df['Sale Date'].dt.quarter
-
-# Create output directory for plots
-output_dir = os.path.join(os.path.dirname(__file__), "plots")
-os.makedirs(output_dir, exist_ok=True)
-
-# 1. Current estimated value of a typical home in the area
-print("\n1. CURRENT ESTIMATED VALUE OF A TYPICAL HOME IN PEARL CITY")
-print("=" * 60)
-
-# Calculate basic statistics
-mean_price = df['Sale Price'].mean()
-median_price = df['Sale Price'].median()
-mean_price_per_sqft = df['Price per Sqft'].mean()
-
-print(f"Mean Sale Price: ${mean_price:,.2f}")
-print(f"Median Sale Price: ${median_price:,.2f}")
-print(f"Mean Price per Square Foot: ${mean_price_per_sqft:.2f}")
-
-# Calculate price trends over time
-yearly_prices = df.groupby('Year')['Sale Price'].agg(['mean', 'median', 'count'])
-print("\nYearly Price Trends:")
-print(yearly_prices)
-
-# Calculate price appreciation rate
-if len(yearly_prices) > 1:
-    first_year = yearly_prices.index.min()
-    last_year = yearly_prices.index.max()
-    price_appreciation = (yearly_prices.loc[last_year, 'mean'] / yearly_prices.loc[first_year, 'mean'] - 1) * 100
-    annual_appreciation = price_appreciation / (last_year - first_year)
-    print(f"\nAnnual Price Appreciation Rate: {annual_appreciation:.2f}%")
-
-# Estimate current value based on the latest data and appreciation rate
-current_year = 2025  # Current year
-years_since_last_data = current_year - last_year
-estimated_current_value = median_price * (1 + annual_appreciation/100) ** years_since_last_data
-
-print(f"\nEstimated Current Value of a Typical Home (as of {current_year}): ${estimated_current_value:,.2f}")
-
-# Plot price distribution
-plt.figure(figsize=(10, 6))
-sns.histplot(df['Sale Price'], kde=True, bins=15)
-plt.title('Distribution of Home Sale Prices in Pearl City (2021-2023)')
-plt.xlabel('Sale Price ($)')
-plt.ylabel('Frequency')
-plt.ticklabel_format(style='plain', axis='x')
-plt.savefig(os.path.join(output_dir, 'price_distribution.png'))
-
-# Plot price trends over time
-plt.figure(figsize=(12, 6))
-df.groupby([df['Sale Date'].dt.year, df['Sale Date'].dt.month])['Sale Price'].mean().plot()
-plt.title('Average Home Sale Price Trend (2021-2023)')
-plt.xlabel('Year-Month')
-plt.ylabel('Average Sale Price ($)')
-plt.grid(True)
-plt.tight_layout()
-plt.savefig(os.path.join(output_dir, 'price_trend.png'))
-
-# 2. Best time to sell based on seasonal trends
-print("\n\n2. BEST TIME TO SELL BASED ON SEASONAL TRENDS")
-print("=" * 60)
-
-# Analyze sales by month
-monthly_sales = df.groupby('Month').agg({
-    'Sale Price': ['mean', 'median', 'count'],
-    'Price per Sqft': 'mean'
-})
-
-print("Monthly Sales Analysis:")
-month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-monthly_sales.index = month_names[:len(monthly_sales)]
-print(monthly_sales)
-
-# Find the month with highest average price
-best_price_month = monthly_sales['Sale Price']['mean'].idxmax()
-best_price_month_value = monthly_sales['Sale Price']['mean'].max()
-
-# Find the month with highest number of sales
-best_volume_month = monthly_sales['Sale Price']['count'].idxmax()
-best_volume_month_value = monthly_sales['Sale Price']['count'].max()
-
-print(f"\nMonth with Highest Average Price: {best_price_month} (${best_price_month_value:,.2f})")
-print(f"Month with Highest Sales Volume: {best_volume_month} ({best_volume_month_value} sales)")
-
-# Plot monthly price trends
-plt.figure(figsize=(12, 6))
-monthly_sales['Sale Price']['mean'].plot(kind='bar', color='skyblue')
-plt.title('Average Sale Price by Month')
-plt.xlabel('Month')
-plt.ylabel('Average Sale Price ($)')
-plt.grid(axis='y')
-plt.tight_layout()
-plt.savefig(os.path.join(output_dir, 'monthly_price_trends.png'))
-
-# Plot monthly sales volume
-plt.figure(figsize=(12, 6))
-monthly_sales['Sale Price']['count'].plot(kind='bar', color='lightgreen')
-plt.title('Number of Home Sales by Month')
-plt.xlabel('Month')
-plt.ylabel('Number of Sales')
-plt.grid(axis='y')
-plt.tight_layout()
-plt.savefig(os.path.join(output_dir, 'monthly_sales_volume.png'))
-
-# Analyze by quarter
-quarterly_sales = df.groupby('Quarter').agg({
-    'Sale Price': ['mean', 'median', 'count'],
-    'Price per Sqft': 'mean'
-})
-
-print("\nQuarterly Sales Analysis:")
-quarterly_sales.index = ['Q1', 'Q2', 'Q3', 'Q4'][:len(quarterly_sales)]
-print(quarterly_sales)
-
-# Find the quarter with highest average price
-best_price_quarter = quarterly_sales['Sale Price']['mean'].idxmax()
-best_price_quarter_value = quarterly_sales['Sale Price']['mean'].max()
-
-print(f"\nQuarter with Highest Average Price: {best_price_quarter} (${best_price_quarter_value:,.2f})")
-
-# 3. Which home improvements might yield the best return on investment
-print("\n\n3. HOME IMPROVEMENTS WITH BEST RETURN ON INVESTMENT")
-print("=" * 60)
-
-# Analyze price differences based on features
-print("Impact of Different Features on Home Price:")
-
-# Impact of number of bedrooms
-bedroom_analysis = df.groupby('Bedrooms').agg({
-    'Sale Price': ['mean', 'median', 'count'],
-    'Price per Sqft': 'mean',
-    'Square Footage': 'mean'
-}).sort_index()
-
-print("\nImpact of Number of Bedrooms:")
-print(bedroom_analysis)
-
-# Impact of number of bathrooms
-bathroom_analysis = df.groupby('Bathrooms').agg({
+import sys
+import argparse
+
+from aggregation import aggregate_breakdowns
+from streaming import StreamingAnalysis, analyze_stream
+from quantiles import DEFAULT_EXACT_LIMIT, DEFAULT_K
+from sales_cache import load_sales_table
+from incremental import DEFAULT_STATE_DIR, IncrementalAnalysis
+from hedonic import HedonicModel
+from bootstrap import DEFAULT_MAX_ROWS, DEFAULT_REPLICATES, bootstrap_contrasts
+from time_index import SalesTimeIndex
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # Repository root
+from instrumentation import configure_tracing, stage
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "pearl_city_home_sales.csv")
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plots")
+
+# Statistics reported for every feature breakdown
+FEATURE_STATS = {
     'Sale Price': ['mean', 'median', 'count'],
     'Price per Sqft': 'mean',
     'Square Footage': 'mean'
-}).sort_index()
-
-print("\nImpact of Number of Bathrooms:")
-print(bathroom_analysis)
-
-# Impact of having a pool
-pool_analysis = df.groupby('Has Pool').agg({
-    'Sale Price': ['mean', 'median', 'count'],
-    'Price per Sqft': 'mean',
-    'Square Footage': 'mean'
-})
-
-print("\nImpact of Having a Pool:")
-print(pool_analysis)
-
-# Calculate the premium for having a pool
-if len(pool_analysis) > 1:
-    pool_premium = pool_analysis['Sale Price']['mean'][True] - pool_analysis['Sale Price']['mean'][False]
-    pool_premium_percentage = (pool_premium / pool_analysis['Sale Price']['mean'][False]) * 100
-    print(f"Pool Premium: ${pool_premium:,.2f} ({pool_premium_percentage:.2f}%)")
-
-# Impact of having a garage
-garage_analysis = df.groupby('Has Garage').agg({
-    'Sale Price': ['mean', 'median', 'count'],
-    'Price per Sqft': 'mean',
-    'Square Footage': 'mean'
-})
-
-print("\nImpact of Having a Garage:")
-print(garage_analysis)
-
-# Calculate the premium for having a garage
-if len(garage_analysis) > 1:
-    garage_premium = garage_analysis['Sale Price']['mean'][True] - garage_analysis['Sale Price']['mean'][False]
-    garage_premium_percentage = (garage_premium / garage_analysis['Sale Price']['mean'][False]) * 100
-    print(f"Garage Premium: ${garage_premium:,.2f} ({garage_premium_percentage:.2f}%)")
-
-# Impact of garage size
-garage_size_analysis = df.groupby('Garage Size').agg({
-    'Sale Price': ['mean', 'median', 'count'],
-    'Price per Sqft': 'mean',
-    'Square Footage': 'mean'
-}).sort_index()
+}
 
-print("\nImpact of Garage Size:")
-print(garage_size_analysis)
+# Every table the analysis reports: name -> (group key, statistics)
+BREAKDOWNS = {
+    'Year': ('Year', {'Sale Price': ['mean', 'median', 'count']}),
+    'Month': ('Month', {'Sale Price': ['mean', 'median', 'count'], 'Price per Sqft': 'mean'}),
+    'Quarter': ('Quarter', {'Sale Price': ['mean', 'median', 'count'], 'Price per Sqft': 'mean'}),
+    'Bedrooms': ('Bedrooms', FEATURE_STATS),
+    'Bathrooms': ('Bathrooms', FEATURE_STATS),
+    'Has Pool': ('Has Pool', FEATURE_STATS),
+    'Has Garage': ('Has Garage', FEATURE_STATS),
+    'Garage Size': ('Garage Size', FEATURE_STATS),
+    'Property Type': ('Property Type', FEATURE_STATS),
+}
 
-# Impact of property type
-property_type_analysis = df.groupby('Property Type').agg({
-    'Sale Price': ['mean', 'median', 'count'],
-    'Price per Sqft': 'mean',
-    'Square Footage': 'mean'
-})
-
-print("\nImpact of Property Type:")
-print(property_type_analysis)
-
-# Plot impact of bedrooms on price
-plt.figure(figsize=(10, 6))
-sns.barplot(x=df['Bedrooms'].astype(str), y=df['Sale Price'])
-plt.title('Impact of Number of Bedrooms on Sale Price')
-plt.xlabel('Number of Bedrooms')
-plt.ylabel('Average Sale Price ($)')
-plt.grid(axis='y')
-plt.tight_layout()
-plt.savefig(os.path.join(output_dir, 'bedroom_impact.png'))
-
-# Plot impact of bathrooms on price
-plt.figure(figsize=(10, 6))
-sns.barplot(x=df['Bathrooms'].astype(str), y=df['Sale Price'])
-plt.title('Impact of Number of Bathrooms on Sale Price')
-plt.xlabel('Number of Bathrooms')
-plt.ylabel('Average Sale Price ($)')
-plt.grid(axis='y')
-plt.tight_layout()
-plt.savefig(os.path.join(output_dir, 'bathroom_impact.png'))
-
-# Plot impact of having a pool
-plt.figure(figsize=(8, 6))
-sns.barplot(x=df['Has Pool'].astype(str), y=df['Sale Price'])
-plt.title('Impact of Having a Pool on Sale Price')
-plt.xlabel('Has Pool')
-plt.ylabel('Average Sale Price ($)')
-plt.grid(axis='y')
-plt.tight_layout()
-plt.savefig(os.path.join(output_dir, 'pool_impact.png'))
-
-# Plot impact of having a garage
-plt.figure(figsize=(8, 6))
-sns.barplot(x=df['Has Garage'].astype(str), y=df['Sale Price'])
-plt.title('Impact of Having a Garage on Sale Price')
-plt.xlabel('Has Garage')
-plt.ylabel('Average Sale Price ($)')
-plt.grid(axis='y')
-plt.tight_layout()
-plt.savefig(os.path.join(output_dir, 'garage_impact.png'))
-
-# Calculate ROI for different improvements
-print("\nEstimated ROI for Different Home Improvements:")
+MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
 
 # Typical costs of improvements (estimated)
-improvement_costs = {
+IMPROVEMENT_COSTS = {
     "Add Bedroom": 50000,
     "Add Bathroom": 30000,
     "Add Pool": 60000,
@@ -269,73 +52,528 @@ improvement_costs = {
     "Upgrade to Single Family": 100000  # If converting from condo/townhouse
 }
 
-# Calculate ROI for adding a bedroom
-if len(bedroom_analysis) > 1:
-    # Find the most common bedroom count
-    most_common_bedroom = df['Bedrooms'].mode()[0]
-    if most_common_bedroom < max(df['Bedrooms']):
-        bedroom_premium = bedroom_analysis['Sale Price']['mean'][most_common_bedroom + 1] - bedroom_analysis['Sale Price']['mean'][most_common_bedroom]
-        bedroom_roi = (bedroom_premium / improvement_costs["Add Bedroom"]) * 100
-        print(f"ROI for Adding a Bedroom (from {most_common_bedroom} to {most_common_bedroom + 1}): {bedroom_roi:.2f}%")
-
-# Calculate ROI for adding a bathroom
-if len(bathroom_analysis) > 1:
-    # Find the most common bathroom count
-    most_common_bathroom = df['Bathrooms'].mode()[0]
-    next_bathroom = sorted(df['Bathrooms'].unique())[list(sorted(df['Bathrooms'].unique())).index(most_common_bathroom) + 1] if list(sorted(df['Bathrooms'].unique())).index(most_common_bathroom) < len(df['Bathrooms'].unique()) - 1 else most_common_bathroom
-    if most_common_bathroom < max(df['Bathrooms']):
-        bathroom_premium = bathroom_analysis['Sale Price']['mean'][next_bathroom] - bathroom_analysis['Sale Price']['mean'][most_common_bathroom]
-        bathroom_roi = (bathroom_premium / improvement_costs["Add Bathroom"]) * 100
-        print(f"ROI for Adding a Bathroom (from {most_common_bathroom} to {next_bathroom}): {bathroom_roi:.2f}%")
-
-# Calculate ROI for adding a pool
-if len(pool_analysis) > 1:
-    pool_roi = (pool_premium / improvement_costs["Add Pool"]) * 100
-    print(f"ROI for Adding a Pool: {pool_roi:.2f}%")
-
-# Calculate ROI for adding a garage
-if len(garage_analysis) > 1:
-    garage_roi = (garage_premium / improvement_costs["Add Garage (1-car)"]) * 100
-    print(f"ROI for Adding a 1-car Garage: {garage_roi:.2f}%")
-
-# Calculate ROI for upgrading garage size
-if 1 in garage_size_analysis.index and 2 in garage_size_analysis.index:
-    garage_upgrade_premium = garage_size_analysis['Sale Price']['mean'][2] - garage_size_analysis['Sale Price']['mean'][1]
-    garage_upgrade_cost = improvement_costs["Add Garage (2-car)"] - improvement_costs["Add Garage (1-car)"]
-    garage_upgrade_roi = (garage_upgrade_premium / garage_upgrade_cost) * 100
-    print(f"ROI for Upgrading from 1-car to 2-car Garage: {garage_upgrade_roi:.2f}%")
-
-# Calculate ROI for property type upgrade if applicable
-if 'Condo' in property_type_analysis.index and 'Single Family' in property_type_analysis.index:
-    property_upgrade_premium = property_type_analysis['Sale Price']['mean']['Single Family'] - property_type_analysis['Sale Price']['mean']['Condo']
-    property_upgrade_roi = (property_upgrade_premium / improvement_costs["Upgrade to Single Family"]) * 100
-    print(f"ROI for Upgrading from Condo to Single Family: {property_upgrade_roi:.2f}%")
-
-# Summary of findings
-print("\nSUMMARY OF FINDINGS")
-print("=" * 60)
-print(f"1. Current Estimated Value: ${estimated_current_value:,.2f}")
-print(f"2. Best Time to Sell: {best_price_month} (highest price) or {best_volume_month} (highest volume)")
-
-# Determine best ROI improvements
-roi_values = {}
-if 'bedroom_roi' in locals():
-    roi_values["Adding a Bedroom"] = bedroom_roi
-if 'bathroom_roi' in locals():
-    roi_values["Adding a Bathroom"] = bathroom_roi
-if 'pool_roi' in locals():
-    roi_values["Adding a Pool"] = pool_roi
-if 'garage_roi' in locals():
-    roi_values["Adding a Garage"] = garage_roi
-if 'garage_upgrade_roi' in locals():
-    roi_values["Upgrading Garage"] = garage_upgrade_roi
-if 'property_upgrade_roi' in locals():
-    roi_values["Upgrading Property Type"] = property_upgrade_roi
-
-if roi_values:
-    best_improvement = max(roi_values, key=roi_values.get)
-    print(f"3. Best Home Improvement for ROI: {best_improvement} ({roi_values[best_improvement]:.2f}%)")
-else:
-    print("3. Insufficient data to determine best home improvement for ROI")
-
-print("\nAnalysis complete. Plots saved to:", output_dir)
\ No newline at end of file
+CURRENT_YEAR = 2025  # Current year
+RECENT_DAYS = 90  # Window of the recent sales report
+
+def load_sales(data_path=DATA_PATH, use_cache=True):
+    """Load the dataset (through its columnar cache); see SalesTimeIndex for the date parts"""
+    return load_sales_table(data_path, use_cache=use_cache)
+
+def compute_tables(df):
+    """All breakdown tables, computed in a single pass over the data"""
+    return aggregate_breakdowns(df, BREAKDOWNS)
+
+def compute_overall(df):
+    """Overall price statistics of the whole dataset"""
+    return {
+        'mean_price': df['Sale Price'].mean(),
+        'median_price': df['Sale Price'].median(),
+        'mean_price_per_sqft': df['Price per Sqft'].mean(),
+    }
+
+def summarize_analysis(analysis):
+    """Report tables and overall statistics from a StreamingAnalysis"""
+    tables = analysis.tables()
+    overall = {
+        'mean_price': analysis.overall('Sale Price', 'mean'),
+        'median_price': analysis.overall('Sale Price', 'median'),
+        'mean_price_per_sqft': analysis.overall('Price per Sqft', 'mean'),
+    }
+    return tables, overall
+
+def typical_home(df):
+    """The most common features among the sales, with median size and age"""
+    home = {column: df[column].mode().iloc[0] for column in ['Bedrooms', 'Bathrooms', 'Has Pool', 'Has Garage', 'Property Type']}
+    home['Garage Size'] = df.loc[df['Has Garage'] == home['Has Garage'], 'Garage Size'].mode().iloc[0]
+    home['Square Footage'] = df['Square Footage'].median()
+    home['Year Built'] = df['Year Built'].median()
+    return home
+
+def model_valuation(model, df):
+    """Hedonic model price of the typical home, averaged over the four quarters of the current year"""
+    dates = pd.to_datetime([f"{CURRENT_YEAR}-{month:02d}-15" for month in (2, 5, 8, 11)])
+    homes = pd.DataFrame({**typical_home(df), 'Sale Date': dates})
+    return model.predict(homes).mean()
+
+def analyze_current_value(overall, tables, model=None, df=None):
+    """1. Current estimated value of a typical home in the area"""
+    print("\n1. CURRENT ESTIMATED VALUE OF A TYPICAL HOME IN PEARL CITY")
+    print("=" * 60)
+
+    # Calculate basic statistics
+    mean_price = overall['mean_price']
+    median_price = overall['median_price']
+    mean_price_per_sqft = overall['mean_price_per_sqft']
+
+    print(f"Mean Sale Price: ${mean_price:,.2f}")
+    print(f"Median Sale Price: ${median_price:,.2f}")
+    print(f"Mean Price per Square Foot: ${mean_price_per_sqft:.2f}")
+
+    # Calculate price trends over time
+    yearly_prices = tables['Year']['Sale Price']
+    print("\nYearly Price Trends:")
+    print(yearly_prices)
+
+    # Calculate price appreciation rate
+    first_year = yearly_prices.index.min()
+    last_year = yearly_prices.index.max()
+    annual_appreciation = 0.0
+    if len(yearly_prices) > 1:
+        price_appreciation = (yearly_prices.loc[last_year, 'mean'] / yearly_prices.loc[first_year, 'mean'] - 1) * 100
+        annual_appreciation = price_appreciation / (last_year - first_year)
+        print(f"\nAnnual Price Appreciation Rate: {annual_appreciation:.2f}%")
+
+    # Estimate current value based on the latest data and appreciation rate
+    years_since_last_data = CURRENT_YEAR - last_year
+    estimated_current_value = median_price * (1 + annual_appreciation/100) ** years_since_last_data
+
+    print(f"\nEstimated Current Value of a Typical Home (as of {CURRENT_YEAR}): ${estimated_current_value:,.2f}")
+
+    # Value the typical home's features directly, with the sale-date trend carried forward
+    model_value = None
+    if model is not None:
+        model_value = model_valuation(model, df)
+        print(f"Hedonic Model Value of a Typical Home (as of {CURRENT_YEAR}): ${model_value:,.2f} "
+              f"(R-squared {model.r_squared:.3f}, residual std ${model.residual_std:,.0f})")
+
+    return {
+        'yearly_prices': yearly_prices,
+        'annual_appreciation': annual_appreciation,
+        'estimated_current_value': estimated_current_value,
+        'model_value': model_value,
+    }
+
+def analyze_seasonality(tables):
+    """2. Best time to sell based on seasonal trends"""
+    print("\n\n2. BEST TIME TO SELL BASED ON SEASONAL TRENDS")
+    print("=" * 60)
+
+    # Analyze sales by month
+    monthly_sales = tables['Month'].copy()
+
+    print("Monthly Sales Analysis:")
+    monthly_sales.index = MONTH_NAMES[:len(monthly_sales)]
+    print(monthly_sales)
+
+    # Find the month with highest average price
+    best_price_month = monthly_sales['Sale Price']['mean'].idxmax()
+    best_price_month_value = monthly_sales['Sale Price']['mean'].max()
+
+    # Find the month with highest number of sales
+    best_volume_month = monthly_sales['Sale Price']['count'].idxmax()
+    best_volume_month_value = monthly_sales['Sale Price']['count'].max()
+
+    print(f"\nMonth with Highest Average Price: {best_price_month} (${best_price_month_value:,.2f})")
+    print(f"Month with Highest Sales Volume: {best_volume_month} ({best_volume_month_value} sales)")
+
+    # Analyze by quarter
+    quarterly_sales = tables['Quarter'].copy()
+
+    print("\nQuarterly Sales Analysis:")
+    quarterly_sales.index = ['Q1', 'Q2', 'Q3', 'Q4'][:len(quarterly_sales)]
+    print(quarterly_sales)
+
+    # Find the quarter with highest average price
+    best_price_quarter = quarterly_sales['Sale Price']['mean'].idxmax()
+    best_price_quarter_value = quarterly_sales['Sale Price']['mean'].max()
+
+    print(f"\nQuarter with Highest Average Price: {best_price_quarter} (${best_price_quarter_value:,.2f})")
+
+    return {
+        'monthly_sales': monthly_sales,
+        'quarterly_sales': quarterly_sales,
+        'best_price_month': best_price_month,
+        'best_volume_month': best_volume_month,
+        'best_price_quarter': best_price_quarter,
+    }
+
+def analyze_recent_sales(sales, days=RECENT_DAYS):
+    """Sales of the last `days` days and of the latest quarter, found by binary search on the sale dates"""
+    print("\nRecent Sales:")
+    latest = pd.Timestamp(sales.dates[-1])
+    recent = sales.last(days)['Sale Price']
+    print(f"Last {days} days (to {latest:%Y-%m-%d}): {len(recent)} sales, average ${recent.mean():,.2f}")
+    quarter = latest.to_period('Q')
+    quarter_prices = sales.period(quarter)['Sale Price']
+    print(f"Latest quarter ({quarter}): {len(quarter_prices)} sales, average ${quarter_prices.mean():,.2f}, "
+          f"median ${quarter_prices.median():,.2f}")
+    return {'recent_mean': recent.mean(), 'recent_count': len(recent),
+            'quarter': str(quarter), 'quarter_mean': quarter_prices.mean()}
+
+def analyze_improvements(tables):
+    """3. Which home improvements might yield the best return on investment"""
+    print("\n\n3. HOME IMPROVEMENTS WITH BEST RETURN ON INVESTMENT")
+    print("=" * 60)
+
+    # Analyze price differences based on features
+    print("Impact of Different Features on Home Price:")
+
+    # Impact of number of bedrooms
+    bedroom_analysis = tables['Bedrooms']
+    print("\nImpact of Number of Bedrooms:")
+    print(bedroom_analysis)
+
+    # Impact of number of bathrooms
+    bathroom_analysis = tables['Bathrooms']
+    print("\nImpact of Number of Bathrooms:")
+    print(bathroom_analysis)
+
+    # Impact of having a pool
+    pool_analysis = tables['Has Pool']
+    print("\nImpact of Having a Pool:")
+    print(pool_analysis)
+
+    # Calculate the premium for having a pool
+    if len(pool_analysis) > 1:
+        pool_premium = pool_analysis['Sale Price']['mean'][True] - pool_analysis['Sale Price']['mean'][False]
+        pool_premium_percentage = (pool_premium / pool_analysis['Sale Price']['mean'][False]) * 100
+        print(f"Pool Premium: ${pool_premium:,.2f} ({pool_premium_percentage:.2f}%)")
+
+    # Impact of having a garage
+    garage_analysis = tables['Has Garage']
+    print("\nImpact of Having a Garage:")
+    print(garage_analysis)
+
+    # Calculate the premium for having a garage
+    if len(garage_analysis) > 1:
+        garage_premium = garage_analysis['Sale Price']['mean'][True] - garage_analysis['Sale Price']['mean'][False]
+        garage_premium_percentage = (garage_premium / garage_analysis['Sale Price']['mean'][False]) * 100
+        print(f"Garage Premium: ${garage_premium:,.2f} ({garage_premium_percentage:.2f}%)")
+
+    # Impact of garage size
+    garage_size_analysis = tables['Garage Size']
+    print("\nImpact of Garage Size:")
+    print(garage_size_analysis)
+
+    # Impact of property type
+    property_type_analysis = tables['Property Type']
+    print("\nImpact of Property Type:")
+    print(property_type_analysis)
+
+    return {
+        'bedroom_analysis': bedroom_analysis,
+        'bathroom_analysis': bathroom_analysis,
+        'pool_analysis': pool_analysis,
+        'garage_analysis': garage_analysis,
+        'garage_size_analysis': garage_size_analysis,
+        'property_type_analysis': property_type_analysis,
+    }
+
+def compute_roi(improvements):
+    """Estimated ROI for different home improvements, keyed by summary label"""
+    print("\nEstimated ROI for Different Home Improvements:")
+
+    bedroom_analysis = improvements['bedroom_analysis']
+    bathroom_analysis = improvements['bathroom_analysis']
+    pool_analysis = improvements['pool_analysis']
+    garage_analysis = improvements['garage_analysis']
+    garage_size_analysis = improvements['garage_size_analysis']
+    property_type_analysis = improvements['property_type_analysis']
+    roi_values = {}
+
+    # Calculate ROI for adding a bedroom
+    if len(bedroom_analysis) > 1:
+        # Find the most common bedroom count
+        most_common_bedroom = bedroom_analysis['Sale Price']['count'].idxmax()
+        if most_common_bedroom < bedroom_analysis.index.max():
+            bedroom_premium = bedroom_analysis['Sale Price']['mean'][most_common_bedroom + 1] - bedroom_analysis['Sale Price']['mean'][most_common_bedroom]
+            bedroom_roi = (bedroom_premium / IMPROVEMENT_COSTS["Add Bedroom"]) * 100
+            print(f"ROI for Adding a Bedroom (from {most_common_bedroom} to {most_common_bedroom + 1}): {bedroom_roi:.2f}%")
+            roi_values["Adding a Bedroom"] = bedroom_roi
+
+    # Calculate ROI for adding a bathroom
+    if len(bathroom_analysis) > 1:
+        # Find the most common bathroom count
+        most_common_bathroom = bathroom_analysis['Sale Price']['count'].idxmax()
+        bathroom_counts = list(bathroom_analysis.index)
+        next_bathroom = bathroom_counts[bathroom_counts.index(most_common_bathroom) + 1] if bathroom_counts.index(most_common_bathroom) < len(bathroom_counts) - 1 else most_common_bathroom
+        if most_common_bathroom < bathroom_analysis.index.max():
+            bathroom_premium = bathroom_analysis['Sale Price']['mean'][next_bathroom] - bathroom_analysis['Sale Price']['mean'][most_common_bathroom]
+            bathroom_roi = (bathroom_premium / IMPROVEMENT_COSTS["Add Bathroom"]) * 100
+            print(f"ROI for Adding a Bathroom (from {most_common_bathroom} to {next_bathroom}): {bathroom_roi:.2f}%")
+            roi_values["Adding a Bathroom"] = bathroom_roi
+
+    # Calculate ROI for adding a pool
+    if len(pool_analysis) > 1:
+        pool_premium = pool_analysis['Sale Price']['mean'][True] - pool_analysis['Sale Price']['mean'][False]
+        pool_roi = (pool_premium / IMPROVEMENT_COSTS["Add Pool"]) * 100
+        print(f"ROI for Adding a Pool: {pool_roi:.2f}%")
+        roi_values["Adding a Pool"] = pool_roi
+
+    # Calculate ROI for adding a garage
+    if len(garage_analysis) > 1:
+        garage_premium = garage_analysis['Sale Price']['mean'][True] - garage_analysis['Sale Price']['mean'][False]
+        garage_roi = (garage_premium / IMPROVEMENT_COSTS["Add Garage (1-car)"]) * 100
+        print(f"ROI for Adding a 1-car Garage: {garage_roi:.2f}%")
+        roi_values["Adding a Garage"] = garage_roi
+
+    # Calculate ROI for upgrading garage size
+    if 1 in garage_size_analysis.index and 2 in garage_size_analysis.index:
+        garage_upgrade_premium = garage_size_analysis['Sale Price']['mean'][2] - garage_size_analysis['Sale Price']['mean'][1]
+        garage_upgrade_cost = IMPROVEMENT_COSTS["Add Garage (2-car)"] - IMPROVEMENT_COSTS["Add Garage (1-car)"]
+        garage_upgrade_roi = (garage_upgrade_premium / garage_upgrade_cost) * 100
+        print(f"ROI for Upgrading from 1-car to 2-car Garage: {garage_upgrade_roi:.2f}%")
+        roi_values["Upgrading Garage"] = garage_upgrade_roi
+
+    # Calculate ROI for property type upgrade if applicable
+    if 'Condo' in property_type_analysis.index and 'Single Family' in property_type_analysis.index:
+        property_upgrade_premium = property_type_analysis['Sale Price']['mean']['Single Family'] - property_type_analysis['Sale Price']['mean']['Condo']
+        property_upgrade_roi = (property_upgrade_premium / IMPROVEMENT_COSTS["Upgrade to Single Family"]) * 100
+        print(f"ROI for Upgrading from Condo to Single Family: {property_upgrade_roi:.2f}%")
+        roi_values["Upgrading Property Type"] = property_upgrade_roi
+
+    return roi_values
+
+def improvement_steps(improvements):
+    """(from, to) counts for adding a bedroom and a bathroom: the most common count and the next one up"""
+    steps = {}
+    for column, key in [('Bedrooms', 'bedroom_analysis'), ('Bathrooms', 'bathroom_analysis')]:
+        counts = improvements[key]['Sale Price']['count']
+        larger = counts.index[counts.index > counts.idxmax()]
+        if len(counts) > 1 and len(larger):
+            # A bedroom is always one more; bathrooms go to the next count seen (often a half bath)
+            steps[column] = (counts.idxmax(), counts.idxmax() + 1 if column == 'Bedrooms' else larger[0])
+    return steps
+
+def compute_model_roi(model, df, improvements):
+    """ROI of each improvement from the hedonic model, with every other feature held fixed"""
+    print("\nHedonic Model Coefficients:")
+    print(model.coefficients.round(2).to_string())
+    print("\nModel-Based ROI (other features held fixed):")
+
+    changes = {}
+    steps = improvement_steps(improvements)
+    if 'Bedrooms' in steps:
+        changes["Adding a Bedroom"] = ({'Bedrooms': steps['Bedrooms'][0]}, {'Bedrooms': steps['Bedrooms'][1]},
+                                       IMPROVEMENT_COSTS["Add Bedroom"])
+    if 'Bathrooms' in steps:
+        changes["Adding a Bathroom"] = ({'Bathrooms': steps['Bathrooms'][0]}, {'Bathrooms': steps['Bathrooms'][1]},
+                                        IMPROVEMENT_COSTS["Add Bathroom"])
+
+    changes["Adding a Pool"] = ({'Has Pool': False}, {'Has Pool': True}, IMPROVEMENT_COSTS["Add Pool"])
+    changes["Adding a Garage"] = ({'Has Garage': False, 'Garage Size': 0}, {'Has Garage': True, 'Garage Size': 1},
+                                  IMPROVEMENT_COSTS["Add Garage (1-car)"])
+    changes["Upgrading Garage"] = ({'Has Garage': True, 'Garage Size': 1}, {'Has Garage': True, 'Garage Size': 2},
+                                   IMPROVEMENT_COSTS["Add Garage (2-car)"] - IMPROVEMENT_COSTS["Add Garage (1-car)"])
+    if 'Condo' in model.property_types and 'Single Family' in model.property_types:
+        changes["Upgrading Property Type"] = ({'Property Type': 'Condo'}, {'Property Type': 'Single Family'},
+                                              IMPROVEMENT_COSTS["Upgrade to Single Family"])
+
+    model_roi = {}
+    for label, (before, after, cost) in changes.items():
+        model_roi[label] = model.effect(df, before, after) / cost * 100
+        print(f"{label}: {model_roi[label]:.2f}%")
+    return model_roi
+
+def roi_contrasts(df, improvements):
+    """Rows of the two groups behind each group-mean ROI figure, and the improvement's cost"""
+    contrasts = {}
+    steps = improvement_steps(improvements)
+    if 'Bedrooms' in steps and steps['Bedrooms'][1] in improvements['bedroom_analysis'].index:
+        contrasts["Adding a Bedroom"] = (df['Bedrooms'] == steps['Bedrooms'][0], df['Bedrooms'] == steps['Bedrooms'][1],
+                                         IMPROVEMENT_COSTS["Add Bedroom"])
+    if 'Bathrooms' in steps:
+        contrasts["Adding a Bathroom"] = (df['Bathrooms'] == steps['Bathrooms'][0], df['Bathrooms'] == steps['Bathrooms'][1],
+                                          IMPROVEMENT_COSTS["Add Bathroom"])
+    if len(improvements['pool_analysis']) > 1:
+        contrasts["Adding a Pool"] = (~df['Has Pool'], df['Has Pool'], IMPROVEMENT_COSTS["Add Pool"])
+    if len(improvements['garage_analysis']) > 1:
+        contrasts["Adding a Garage"] = (~df['Has Garage'], df['Has Garage'], IMPROVEMENT_COSTS["Add Garage (1-car)"])
+    if {1, 2} <= set(improvements['garage_size_analysis'].index):
+        contrasts["Upgrading Garage"] = (df['Garage Size'] == 1, df['Garage Size'] == 2,
+                                         IMPROVEMENT_COSTS["Add Garage (2-car)"] - IMPROVEMENT_COSTS["Add Garage (1-car)"])
+    if {'Condo', 'Single Family'} <= set(improvements['property_type_analysis'].index):
+        contrasts["Upgrading Property Type"] = (df['Property Type'] == 'Condo', df['Property Type'] == 'Single Family',
+                                                IMPROVEMENT_COSTS["Upgrade to Single Family"])
+    return contrasts
+
+def compute_roi_intervals(df, improvements, replicates=DEFAULT_REPLICATES, workers=1, max_rows=DEFAULT_MAX_ROWS):
+    """Bootstrap 95% confidence intervals for the group-mean ROI figures"""
+    contrasts = {label: (before, after, 100 / cost) for label, (before, after, cost) in roi_contrasts(df, improvements).items()}
+    if not contrasts:
+        return None
+    intervals = bootstrap_contrasts(df['Sale Price'], contrasts, replicates=replicates, workers=workers, max_rows=max_rows)
+    subset = f" of {max_rows:,} random sales, rescaled to all {len(df):,}" if max_rows and len(df) > max_rows else ""
+    print(f"\nROI 95% Confidence Intervals ({replicates:,} bootstrap resamples{subset}):")
+    for label, row in intervals.iterrows():
+        print(f"{label}: {row['estimate']:.2f}% ({row['lower']:.2f}% to {row['upper']:.2f}%)")
+    return intervals
+
+def price_overview_plots(sales):
+    """Price distribution and price trend charts (from a SalesTimeIndex)"""
+    df = sales.frame
+    monthly_means = sales.period_means('Sale Price', 'M')
+    return [
+        {'name': 'price_distribution.png', 'render': 'render_histogram', 'data': df['Sale Price'],
+         'params': {'figsize': (10, 6), 'bins': 15, 'title': 'Distribution of Home Sale Prices in Pearl City (2021-2023)',
+                    'xlabel': 'Sale Price ($)', 'ylabel': 'Frequency'}},
+        {'name': 'price_trend.png', 'render': 'render_line', 'data': monthly_means,
+         'params': {'figsize': (12, 6), 'title': 'Average Home Sale Price Trend (2021-2023)', 'xlabel': 'Year-Month',
+                    'ylabel': 'Average Sale Price ($)', 'grid': True, 'tight_layout': True}},
+    ]
+
+def seasonality_plots(monthly_sales):
+    """Monthly price and sales volume charts"""
+    return [
+        {'name': 'monthly_price_trends.png', 'render': 'render_bar', 'data': monthly_sales['Sale Price']['mean'],
+         'params': {'figsize': (12, 6), 'color': 'skyblue', 'title': 'Average Sale Price by Month', 'xlabel': 'Month',
+                    'ylabel': 'Average Sale Price ($)', 'grid': 'y', 'tight_layout': True}},
+        {'name': 'monthly_sales_volume.png', 'render': 'render_bar', 'data': monthly_sales['Sale Price']['count'],
+         'params': {'figsize': (12, 6), 'color': 'lightgreen', 'title': 'Number of Home Sales by Month', 'xlabel': 'Month',
+                    'ylabel': 'Number of Sales', 'grid': 'y', 'tight_layout': True}},
+    ]
+
+def feature_impact_plots(df):
+    """Average sale price by bedrooms, bathrooms, pool and garage"""
+    features = [
+        ('bedroom_impact.png', 'Bedrooms', (10, 6), 'Impact of Number of Bedrooms on Sale Price', 'Number of Bedrooms'),
+        ('bathroom_impact.png', 'Bathrooms', (10, 6), 'Impact of Number of Bathrooms on Sale Price', 'Number of Bathrooms'),
+        ('pool_impact.png', 'Has Pool', (8, 6), 'Impact of Having a Pool on Sale Price', 'Has Pool'),
+        ('garage_impact.png', 'Has Garage', (8, 6), 'Impact of Having a Garage on Sale Price', 'Has Garage'),
+    ]
+    # Bars follow the feature's values rather than the order rows happen to appear in
+    return [
+        {'name': name, 'render': 'render_barplot',
+         'data': pd.DataFrame({'x': df[column].astype(str), 'y': df['Sale Price']})
+                   .iloc[np.argsort(df[column].to_numpy(), kind='stable')],
+         'params': {'figsize': figsize, 'title': title, 'xlabel': xlabel, 'ylabel': 'Average Sale Price ($)',
+                    'grid': 'y', 'tight_layout': True}}
+        for name, column, figsize, title, xlabel in features
+    ]
+
+def print_summary(current_value, seasonality, roi_values, model_roi=None, roi_intervals=None):
+    # Summary of findings
+    print("\nSUMMARY OF FINDINGS")
+    print("=" * 60)
+    print(f"1. Current Estimated Value: ${current_value['estimated_current_value']:,.2f}")
+    if current_value.get('model_value') is not None:
+        print(f"   Hedonic Model Value: ${current_value['model_value']:,.2f}")
+    print(f"2. Best Time to Sell: {seasonality['best_price_month']} (highest price) or {seasonality['best_volume_month']} (highest volume)")
+
+    # Determine best ROI improvements
+    if roi_values:
+        best_improvement = max(roi_values, key=roi_values.get)
+        print(f"3. Best Home Improvement for ROI: {best_improvement} ({roi_values[best_improvement]:.2f}%)")
+        if roi_intervals is not None and best_improvement in roi_intervals.index:
+            interval = roi_intervals.loc[best_improvement]
+            print(f"   95% Confidence Interval: {interval['lower']:.2f}% to {interval['upper']:.2f}%")
+    else:
+        print("3. Insufficient data to determine best home improvement for ROI")
+    if model_roi:
+        best_model_improvement = max(model_roi, key=model_roi.get)
+        print(f"   Hedonic Model Best ROI: {best_model_improvement} ({model_roi[best_model_improvement]:.2f}%)")
+
+def main(data_paths=(DATA_PATH,), output_dir=OUTPUT_DIR, stream=False, chunksize=100000,
+         quantiles="auto", quantile_k=DEFAULT_K, plot_workers=None, incremental=False, state_dir=DEFAULT_STATE_DIR,
+         bootstrap=DEFAULT_REPLICATES, bootstrap_workers=1, plots=True, cache=True,
+         bootstrap_rows=DEFAULT_MAX_ROWS):
+    if incremental:
+        # Fold only the sales appended since the last run into the saved per-month aggregates
+        with stage("incremental refresh"):
+            state = IncrementalAnalysis.load(data_paths[0], BREAKDOWNS, state_dir, quantile_mode=quantiles, quantile_k=quantile_k)
+            new_rows, rebuilt = state.refresh(chunksize=chunksize)
+            state.save(state_dir)
+        action = "Earlier rows changed, rebuilt from" if rebuilt else "Folded in"
+        print(f"{action} {new_rows} new sales ({state.processed_rows} total, {len(state.partitions)} monthly partitions)")
+        with stage("aggregate"):
+            tables, overall = summarize_analysis(state.combined())
+        df = None
+    elif stream:
+        # Fold the sales files in chunk by chunk; only the per-group statistics stay in memory
+        with stage("stream aggregate"):
+            analysis = analyze_stream(list(data_paths), BREAKDOWNS, chunksize=chunksize,
+                                      quantile_mode=quantiles, quantile_k=quantile_k)
+            tables, overall = summarize_analysis(analysis)
+        df = None
+    else:
+        with stage("load sales"):
+            # Sorted by sale date once; the time-based sections query this index
+            sales = SalesTimeIndex(pd.concat([load_sales(path, use_cache=cache) for path in data_paths], ignore_index=True))
+            df = sales.with_date_parts()
+        if sales.dropped:
+            print(f"Skipped {sales.dropped} sales without a sale date")
+        with stage("aggregate", rows=len(df)):
+            if quantiles == "exact" or (quantiles == "auto" and len(df) <= DEFAULT_EXACT_LIMIT):
+                tables = compute_tables(df)
+                overall = compute_overall(df)
+            else:
+                # Medians from quantile sketches instead of a full sort per group
+                tables, overall = summarize_analysis(StreamingAnalysis(BREAKDOWNS, "approx", quantile_k).update(df))
+
+    # The hedonic model is fitted on individual sales, so streaming and incremental modes go without it
+    if df is None:
+        print("The hedonic model, Recent Sales and bootstrap intervals need the individual sales; "
+              "skipped in --stream and --incremental modes")
+    with stage("hedonic fit"):
+        model = HedonicModel().fit(df) if df is not None else None
+
+    with stage("current value"):
+        current_value = analyze_current_value(overall, tables, model, df)
+    if df is not None:
+        with stage("recent sales"):
+            analyze_recent_sales(sales)
+    with stage("seasonality"):
+        seasonality = analyze_seasonality(tables)
+    with stage("improvements"):
+        improvements = analyze_improvements(tables)
+        roi_values = compute_roi(improvements)
+        model_roi = compute_model_roi(model, df, improvements) if model is not None else None
+    roi_intervals = None
+    if df is not None and bootstrap:
+        with stage("bootstrap", replicates=bootstrap):
+            roi_intervals = compute_roi_intervals(df, improvements, replicates=bootstrap, workers=bootstrap_workers,
+                                                  max_rows=bootstrap_rows)
+
+    print_summary(current_value, seasonality, roi_values, model_roi, roi_intervals)
+
+    if not plots:
+        print("\nAnalysis complete (plots skipped).")
+        return
+
+    # Charts built from individual sales need the rows in memory, so streaming and incremental modes skip them
+    with stage("render plots"):
+        # Imported here so numbers-only runs never load matplotlib or seaborn
+        from plotting import render_plots
+        os.makedirs(output_dir, exist_ok=True)
+        plot_jobs = seasonality_plots(seasonality['monthly_sales'])
+        if df is not None:
+            plot_jobs = price_overview_plots(sales) + plot_jobs + feature_impact_plots(df)
+        render_plots(plot_jobs, output_dir, workers=plot_workers)
+    print("\nAnalysis complete. Plots saved to:", output_dir)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyze Pearl City home sales")
+    parser.add_argument("--data", nargs="+", default=[DATA_PATH], help="One or more sales CSV files")
+    parser.add_argument("--stream", action="store_true",
+                        help="Read the sales in chunks with bounded memory (row-level plots are skipped)")
+    parser.add_argument("--chunksize", type=int, default=100000, help="Rows per chunk in streaming mode")
+    parser.add_argument("--quantiles", choices=["exact", "approx", "auto"], default="auto",
+                        help="Exact medians, KLL sketch medians, or exact until a group outgrows "
+                             f"{DEFAULT_EXACT_LIMIT:,} sales (default)")
+    parser.add_argument("--quantile-k", type=int, default=DEFAULT_K,
+                        help="KLL sketch size; the rank error of sketch medians is roughly 2/k")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Keep per-month aggregates on disk and only fold in newly appended sales")
+    parser.add_argument("--state-dir", default=DEFAULT_STATE_DIR, help="Where incremental mode keeps its state")
+    parser.add_argument("--plot-workers", type=int, help="Processes used to render charts (default: one per CPU)")
+    parser.add_argument("--bootstrap", type=int, default=DEFAULT_REPLICATES,
+                        help="Bootstrap resamples for the ROI confidence intervals (0 to skip)")
+    parser.add_argument("--bootstrap-workers", type=int, default=1,
+                        help="Processes used for the bootstrap on large datasets")
+    parser.add_argument("--bootstrap-rows", type=int, default=DEFAULT_MAX_ROWS,
+                        help="Bootstrap larger datasets on a random subset of this many sales, with the interval "
+                             "widths rescaled to the full data (0 resamples every sale)")
+    parser.add_argument("--no-plots", action="store_true",
+                        help="Numbers only: print the report without importing the plotting libraries")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Parse the CSV every run instead of reading or writing the columnar cache")
+    parser.add_argument("--trace", help="Write per-stage timings and memory peaks to this Chrome trace file "
+                                        "(or set PERF_TRACE)")
+    args = parser.parse_args()
+    configure_tracing(args.trace)
+    if args.incremental and len(args.data) > 1:
+        parser.error("--incremental works on a single sales file")
+    main(args.data, stream=args.stream, chunksize=args.chunksize, quantiles=args.quantiles, quantile_k=args.quantile_k,
+         plot_workers=args.plot_workers, incremental=args.incremental, state_dir=args.state_dir,
+         bootstrap=args.bootstrap, bootstrap_workers=args.bootstrap_workers, plots=not args.no_plots,
+         cache=not args.no_cache, bootstrap_rows=args.bootstrap_rows)
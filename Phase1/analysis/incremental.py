@@ -0,0 +1,152 @@
+import hashlib
+import io
+import os
+import pickle
+
+import pandas as pd
+
+from quantiles import DEFAULT_K
+from streaming import StreamingAnalysis, add_date_parts
+
+STATE_VERSION = 2
+DEFAULT_STATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".analysis_state")
+
+def _hash_range(digest, f, num_bytes, block_size=1 << 20):
+    remaining = num_bytes
+    while remaining > 0:
+        block = f.read(min(block_size, remaining))
+        if not block:
+            break
+        digest.update(block)
+        remaining -= len(block)
+    return digest
+
+def _last_line_end(path, block_size=1 << 16):
+    # Offset just past the last newline, so a partly written last line is left for the next refresh
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        while position > 0:
+            start = max(0, position - block_size)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b"\n")
+            if newline >= 0:
+                return start + newline + 1
+            position = start
+    return 0
+
+class _RangeReader(io.RawIOBase):
+    """Read-only view of bytes [start, end) of a file, for pandas to parse without loading it all"""
+
+    def __init__(self, f, start, end):
+        self._f = f
+        self._f.seek(start)
+        self._remaining = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self._remaining)
+        data = self._f.read(size)
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+class IncrementalAnalysis:
+    """Per-month StreamingAnalysis partitions of an append-only sales file, kept on disk.
+
+    `refresh` only parses the bytes appended since the last run and folds them into the partition of
+    their sale month, and into a running total of every partition so `combined` needs no merging.
+    If the part of the file that was already processed no longer matches its checksum (earlier rows
+    were edited or the file was replaced), every partition is rebuilt.
+
+    Unless exact medians are requested, the saved medians are KLL sketches (exact until a group
+    outgrows the sketch) rather than every sale price, which keeps the state small.
+    """
+
+    def __init__(self, data_path, breakdowns, quantile_mode="auto", quantile_k=DEFAULT_K):
+        self.data_path = os.path.abspath(data_path)
+        self.breakdowns = breakdowns
+        self.quantile_mode = quantile_mode
+        self.quantile_k = quantile_k
+        self.partitions = {}
+        self.total = self._analysis()
+        self.header = None
+        self.processed_bytes = 0
+        self.processed_rows = 0
+        self.checksum = hashlib.sha256().hexdigest()
+
+    @staticmethod
+    def state_path(data_path, state_dir=DEFAULT_STATE_DIR):
+        name = os.path.splitext(os.path.basename(data_path))[0]
+        return os.path.join(state_dir, f"{name}.pkl")
+
+    @classmethod
+    def load(cls, data_path, breakdowns, state_dir=DEFAULT_STATE_DIR, quantile_mode="auto", quantile_k=DEFAULT_K):
+        """Load the saved state for `data_path`, or start empty if there is none or it is for other settings"""
+        try:
+            with open(cls.state_path(data_path, state_dir), "rb") as f:
+                version, state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return cls(data_path, breakdowns, quantile_mode, quantile_k)
+        settings = (state.data_path, state.breakdowns, state.quantile_mode, state.quantile_k)
+        if version != STATE_VERSION or settings != (os.path.abspath(data_path), breakdowns, quantile_mode, quantile_k):
+            return cls(data_path, breakdowns, quantile_mode, quantile_k)
+        return state
+
+    def save(self, state_dir=DEFAULT_STATE_DIR):
+        os.makedirs(state_dir, exist_ok=True)
+        path = self.state_path(self.data_path, state_dir)
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump((STATE_VERSION, self), f)
+        os.replace(path + ".tmp", path)
+
+    def _analysis(self):
+        return StreamingAnalysis(self.breakdowns, "exact" if self.quantile_mode == "exact" else "approx", self.quantile_k)
+
+    def _reset(self):
+        self.partitions = {}
+        self.total = self._analysis()
+        self.header = None
+        self.processed_bytes = 0
+        self.processed_rows = 0
+
+    def _fold(self, chunk):
+        chunk = add_date_parts(chunk)
+        months = chunk['Sale Date'].dt.to_period('M').astype(str)
+        for month, part in chunk.groupby(months.to_numpy()):
+            if month not in self.partitions:
+                self.partitions[month] = self._analysis()
+            self.partitions[month].update(part)
+        self.total.update(chunk)
+
+    def refresh(self, chunksize=100000):
+        """Fold in rows appended since the last refresh; returns (new rows, rebuilt)"""
+        end = _last_line_end(self.data_path)
+        with open(self.data_path, "rb") as f:
+            # Checksum the part already processed, then carry the same digest on over the new bytes
+            digest = _hash_range(hashlib.sha256(), f, self.processed_bytes)
+            rebuilt = end < self.processed_bytes or digest.hexdigest() != self.checksum
+            if rebuilt:
+                self._reset()
+                digest = hashlib.sha256()
+                f.seek(0)
+            _hash_range(digest, f, end - self.processed_bytes)
+
+            new_rows = 0
+            if end > self.processed_bytes:
+                reader = io.BufferedReader(_RangeReader(f, self.processed_bytes, end))
+                if self.header is None:
+                    self.header = pd.read_csv(io.BytesIO(reader.readline()), nrows=0).columns.tolist()
+                for chunk in pd.read_csv(reader, names=self.header, header=None, chunksize=chunksize):
+                    self._fold(chunk)
+                    new_rows += len(chunk)
+
+        self.processed_bytes = end
+        self.processed_rows += new_rows
+        self.checksum = digest.hexdigest()
+        return new_rows, rebuilt
+
+    def combined(self):
+        """All partitions together as one StreamingAnalysis, kept up to date by `refresh`"""
+        return self.total
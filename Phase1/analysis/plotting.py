@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use("Agg")  # Render off-screen, in the main process and in every worker
+import matplotlib.pyplot as plt
+import pandas as pd
+import seaborn as sns
+
+# Set style for plots
+plt.style.use('ggplot')
+sns.set_palette("Set2")
+
+# Bump to re-render every chart after changing how charts are drawn
+PLOT_CACHE_VERSION = 1
+CACHE_FILE = ".plot_cache.json"
+
+def _finish(fig, ax, params, path):
+    ax.set_title(params['title'])
+    ax.set_xlabel(params['xlabel'])
+    ax.set_ylabel(params['ylabel'])
+    if params.get('grid') is True:
+        ax.grid(True)
+    elif params.get('grid'):
+        ax.grid(axis=params['grid'])
+    if params.get('tight_layout'):
+        fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+
+def render_histogram(data, params, path):
+    fig, ax = plt.subplots(figsize=params['figsize'])
+    sns.histplot(data, kde=True, bins=params['bins'], ax=ax)
+    ax.ticklabel_format(style='plain', axis='x')
+    _finish(fig, ax, params, path)
+
+def render_line(data, params, path):
+    fig, ax = plt.subplots(figsize=params['figsize'])
+    data.plot(ax=ax)
+    _finish(fig, ax, params, path)
+
+def render_bar(data, params, path):
+    fig, ax = plt.subplots(figsize=params['figsize'])
+    data.plot(kind='bar', color=params['color'], ax=ax)
+    _finish(fig, ax, params, path)
+
+def render_barplot(data, params, path):
+    # Mean sale price per category, with seaborn's confidence interval
+    fig, ax = plt.subplots(figsize=params['figsize'])
+    sns.barplot(x=data['x'], y=data['y'], ax=ax)
+    _finish(fig, ax, params, path)
+
+RENDERERS = {render.__name__: render for render in [render_histogram, render_line, render_bar, render_barplot]}
+
+def plot_hash(job):
+    """Hash of everything a chart depends on: its input data, parameters and renderer"""
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(job['data'], index=True).to_numpy().tobytes())
+    digest.update(json.dumps(job['params'], sort_keys=True, default=str).encode())
+    digest.update(f"{job['render']}:{PLOT_CACHE_VERSION}".encode())
+    return digest.hexdigest()
+
+def _render_job(job, path):
+    RENDERERS[job['render']](job['data'], job['params'], path)
+    return job['name']
+
+def render_plots(jobs, output_dir, workers=None):
+    """Render chart jobs in a process pool, skipping charts whose inputs have not changed.
+
+    Each job is a dict with the output file `name`, the name of its `render` function, its input
+    `data` (Series or DataFrame) and `params`. Returns the names of the charts that were rendered.
+    """
+    cache_path = os.path.join(output_dir, CACHE_FILE)
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+
+    stale = []
+    for job in jobs:
+        job_hash = plot_hash(job)
+        if cache.get(job['name']) != job_hash or not os.path.exists(os.path.join(output_dir, job['name'])):
+            stale.append((job, job_hash))
+
+    if workers == 1 or len(stale) <= 1:
+        for job, _ in stale:
+            _render_job(job, os.path.join(output_dir, job['name']))
+    elif stale:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_render_job, job, os.path.join(output_dir, job['name'])) for job, _ in stale]
+            for future in futures:
+                future.result()
+
+    for job, job_hash in stale:
+        cache[job['name']] = job_hash
+    with open(cache_path, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    return [job['name'] for job, _ in stale]
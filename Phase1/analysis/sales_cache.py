@@ -0,0 +1,128 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import pandas as pd
+
+CACHE_VERSION = 1
+CACHE_DIR_NAME = ".sales_cache"
+
+# Compact dtypes for the sales columns; anything not listed keeps the type pandas infers
+SALES_DTYPES = {
+    "Sale Price": "int32",
+    "Square Footage": "int16",
+    "Bedrooms": "int16",
+    "Bathrooms": "float32",
+    "Year Built": "int16",
+    "Property Type": "category",
+    "Lot Size (sqft)": "int32",
+    "Has Pool": "bool",
+    "Has Garage": "bool",
+    "Garage Size": "int16",
+}
+
+def read_sales_csv(data_path):
+    """Parse the sales CSV straight into compact dtypes"""
+    header = pd.read_csv(data_path, nrows=0).columns
+    dtypes = {column: dtype for column, dtype in SALES_DTYPES.items() if column in header}
+    df = pd.read_csv(data_path, dtype=dtypes, parse_dates=["Sale Date"] if "Sale Date" in header else False)
+    return df
+
+def cache_paths(data_path):
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(data_path)), CACHE_DIR_NAME)
+    name = os.path.splitext(os.path.basename(data_path))[0]
+    return os.path.join(cache_dir, f"{name}.feather"), os.path.join(cache_dir, f"{name}.json")
+
+def _file_checksum(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _cache_is_valid(data_path, meta_path):
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+    stat = os.stat(data_path)
+    if meta.get("version") != CACHE_VERSION or meta.get("size") != stat.st_size:
+        return False
+    # A newer modification time alone is not enough: the file may have been touched but not changed
+    if meta.get("mtime_ns") != stat.st_mtime_ns:
+        if meta.get("sha256") != _file_checksum(data_path):
+            return False
+        meta["mtime_ns"] = stat.st_mtime_ns
+        with open(meta_path, "w") as f:
+            json.dump(meta, f)
+    return True
+
+def load_sales_table(data_path, use_cache=True):
+    """Load the sales CSV through a Feather cache stored next to it.
+
+    The cache is rebuilt whenever the CSV's size or contents change. Without pyarrow the CSV is
+    parsed directly (still into compact dtypes).
+    """
+    if not use_cache:
+        return read_sales_csv(data_path)
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        return read_sales_csv(data_path)
+
+    cache_path, meta_path = cache_paths(data_path)
+    if os.path.exists(cache_path) and _cache_is_valid(data_path, meta_path):
+        return feather.read_table(cache_path, memory_map=True).to_pandas()
+
+    stat = os.stat(data_path)
+    df = read_sales_csv(data_path)
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    df.to_feather(cache_path + ".tmp", compression="uncompressed")
+    os.replace(cache_path + ".tmp", cache_path)
+    with open(meta_path, "w") as f:
+        json.dump({"version": CACHE_VERSION, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                   "sha256": _file_checksum(data_path)}, f)
+    return df
+
+def _time_load(load, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        df = load()
+        best = min(best, time.perf_counter() - start)
+    return df, best
+
+def report(data_path, repeats=5):
+    """Memory use and load time of the plain CSV load against the compact, cached load"""
+    def plain_load():
+        df = pd.read_csv(data_path)
+        df["Sale Date"] = pd.to_datetime(df["Sale Date"])
+        return df
+
+    load_sales_table(data_path)  # Make sure the cache exists
+    plain, plain_time = _time_load(plain_load, repeats)
+    compact, compact_time = _time_load(lambda: read_sales_csv(data_path), repeats)
+    cached, cached_time = _time_load(lambda: load_sales_table(data_path), repeats)
+
+    print(f"Sales file: {data_path} ({len(plain):,} rows)")
+    print(f"{'Load':<28}{'Memory (MB)':>14}{'Time (ms)':>12}")
+    for label, df, seconds in [("CSV, default dtypes", plain, plain_time),
+                               ("CSV, compact dtypes", compact, compact_time),
+                               ("Feather cache, compact", cached, cached_time)]:
+        print(f"{label:<28}{df.memory_usage(deep=True).sum() / 1e6:>14.2f}{seconds * 1000:>12.1f}")
+
+    print("\nColumn dtypes (before -> after):")
+    for column in plain.columns:
+        print(f"  {column:<18}{str(plain[column].dtype):>16} -> {cached[column].dtype}")
+
+if __name__ == "__main__":
+    from home_sales_analysis import DATA_PATH
+
+    parser = argparse.ArgumentParser(description="Report memory use and load time of the sales cache")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    report(args.data, args.repeats)
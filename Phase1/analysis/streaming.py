@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+
+from aggregation import aggregate_breakdowns
+from quantiles import DEFAULT_K, EXACT_LIMITS, GroupQuantiles
+
+# Mergeable statistics kept for every group; everything else is derived from them
+MOMENTS = ["count", "sum", "sumsq", "min", "max"]
+ADDITIVE_MOMENTS = {"count", "sum", "sumsq"}
+
+OVERALL_KEY = "All Sales"
+
+def add_date_parts(df):
+    """Derive the date parts used by the analysis from 'Sale Date'"""
+    df['Sale Date'] = pd.to_datetime(df['Sale Date'])
+    df['Month'] = df['Sale Date'].dt.month
+    df['Year'] = df['Sale Date'].dt.year
+    df['Quarter'] = df['Sale Date'].dt.quarter
+    return df
+
+def merge_moments(left, right):
+    """Merge two moment tables (index: group key, columns: (value column, moment))"""
+    index = left.index.union(right.index)
+    if not right.columns.equals(left.columns):
+        right = right.reindex(columns=left.columns)
+    # Align both tables on the shared index as plain arrays; groups missing on one side are NaN there
+    sides = []
+    for table in (left, right):
+        values = table.to_numpy(dtype=float)
+        if not table.index.equals(index):
+            aligned = np.full((len(index), len(table.columns)), np.nan)
+            aligned[index.get_indexer(table.index)] = values
+            values = aligned
+        sides.append(values)
+    a, b = sides
+    moments = left.columns.get_level_values(1)
+    additive = moments.isin(ADDITIVE_MOMENTS)
+    minimum = moments == "min"
+    maximum = ~additive & ~minimum
+    merged = np.empty_like(a)
+    merged[:, additive] = np.nan_to_num(a[:, additive]) + np.nan_to_num(b[:, additive])
+    merged[:, minimum] = np.fmin(a[:, minimum], b[:, minimum])
+    merged[:, maximum] = np.fmax(a[:, maximum], b[:, maximum])
+    # Built column by column and labelled afterwards: casting counts back with astype, or passing
+    # tuple labels, rebuilds the column MultiIndex and costs more than the merge itself
+    merged = pd.DataFrame({position: merged[:, position].astype(np.int64) if moment == "count" else merged[:, position]
+                           for position, moment in enumerate(moments)}, index=index)
+    merged.columns = left.columns
+    return merged
+
+def summarize_moments(moments, value_stats, medians=None):
+    """Turn a moment table into the report table for the requested statistics"""
+    medians = medians or {}
+    columns = {}
+    for column, stats in value_stats.items():
+        stats = [stats] if isinstance(stats, str) else stats
+        count = moments[(column, "count")]
+        total = moments[(column, "sum")]
+        for stat in stats:
+            if stat == "mean":
+                columns[(column, stat)] = total / count
+            elif stat == "std":
+                columns[(column, stat)] = np.sqrt(((moments[(column, "sumsq")] - total ** 2 / count) / (count - 1)).clip(lower=0))
+            elif stat in MOMENTS:
+                columns[(column, stat)] = moments[(column, stat)]
+            elif stat == "median" and column in medians:
+                columns[(column, stat)] = medians[column].reindex(moments.index)
+            else:
+                # Order statistics such as the median cannot be rebuilt from moments
+                columns[(column, stat)] = pd.Series(np.nan, index=moments.index)
+    return pd.DataFrame(columns, index=moments.index)
+
+class StreamingAnalysis:
+    """Per-group count, sum, sum of squares, min and max for every breakdown of the analysis.
+
+    Chunks are folded in one at a time with `update`, so memory only depends on the number of
+    groups, and two instances built from different files (or parts of one file) combine with `merge`.
+    Medians come from per-group quantile accumulators: exact values for small groups and a KLL
+    sketch of size `quantile_k` once a group holds more than the mode's exact limit.
+    """
+
+    def __init__(self, breakdowns, quantile_mode="auto", quantile_k=DEFAULT_K):
+        self.breakdowns = dict(breakdowns)
+        # Overall statistics of every value column, with medians only where a breakdown reports them
+        self.breakdowns[OVERALL_KEY] = (OVERALL_KEY, {column: ["median"] if self._reports_median(column) else []
+                                                      for column in self._value_columns()})
+        self.moments = {}
+
+        # Only the columns whose median is reported get quantile accumulators
+        exact_limit = EXACT_LIMITS[quantile_mode]
+        self.quantiles = {}
+        for name, (key, value_stats) in self.breakdowns.items():
+            for column, stats in value_stats.items():
+                if "median" in ([stats] if isinstance(stats, str) else stats):
+                    self.quantiles[(name, column)] = GroupQuantiles(quantile_k, exact_limit)
+
+    def _reports_median(self, column):
+        return any("median" in ([value_stats[column]] if isinstance(value_stats[column], str) else value_stats[column])
+                   for _, value_stats in self.breakdowns.values() if column in value_stats)
+
+    def _value_columns(self):
+        return list(dict.fromkeys(column for _, value_stats in self.breakdowns.values() for column in value_stats))
+
+    def update(self, chunk):
+        chunk = chunk.assign(**{OVERALL_KEY: 0})
+        moment_specs = {name: (key, {column: MOMENTS for column in value_stats})
+                        for name, (key, value_stats) in self.breakdowns.items()}
+        for name, table in aggregate_breakdowns(chunk, moment_specs).items():
+            self.moments[name] = merge_moments(self.moments[name], table) if name in self.moments else table
+        for (name, column), group_quantiles in self.quantiles.items():
+            group_quantiles.update(chunk[self.breakdowns[name][0]], chunk[column])
+        return self
+
+    def merge(self, other):
+        for name, table in other.moments.items():
+            self.moments[name] = merge_moments(self.moments[name], table) if name in self.moments else table
+        for group_key, group_quantiles in other.quantiles.items():
+            self.quantiles[group_key].merge(group_quantiles)
+        return self
+
+    def _medians(self, name):
+        return {column: group_quantiles.quantile(0.5)
+                for (quantile_name, column), group_quantiles in self.quantiles.items() if quantile_name == name}
+
+    def table(self, name):
+        """Report table for one breakdown, shaped like the in-memory groupby table"""
+        key, value_stats = self.breakdowns[name]
+        return summarize_moments(self.moments[name], value_stats, self._medians(name))
+
+    def tables(self):
+        return {name: self.table(name) for name in self.breakdowns if name != OVERALL_KEY}
+
+    def overall(self, column, stat):
+        return summarize_moments(self.moments[OVERALL_KEY], {column: [stat]}, self._medians(OVERALL_KEY)).iloc[0, 0]
+
+def analyze_stream(paths, breakdowns, chunksize=100000, quantile_mode="auto", quantile_k=DEFAULT_K):
+    """Fold one or more sales CSV files into a StreamingAnalysis, chunk by chunk"""
+    if isinstance(paths, str):
+        paths = [paths]
+    analysis = StreamingAnalysis(breakdowns, quantile_mode=quantile_mode, quantile_k=quantile_k)
+    for path in paths:
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            analysis.update(add_date_parts(chunk))
+    return analysis
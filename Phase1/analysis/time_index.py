@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+class SalesTimeIndex:
+    """Sales kept sorted by sale date, with the calendar period of every sale precomputed.
+
+    Dates are parsed once. Year, quarter and month codes are derived from the sorted datetime64
+    values with integer arithmetic, so every period is a contiguous run of rows. A date range or
+    a period ("2022Q2", "2022-05", "2022") is found by binary search on the sorted dates and
+    returned as a slice, and per-period statistics come from np.add.reduceat over the runs
+    instead of a groupby. Sales without a sale date (NaT) are dropped; `dropped` counts them.
+    """
+
+    def __init__(self, df, column="Sale Date"):
+        dates = pd.to_datetime(df[column]).to_numpy()
+        # NaT sorts last; cut it off so every kept row has a period
+        order = np.argsort(dates, kind="stable")
+        order = order[:len(order) - int(np.isnat(dates).sum())]
+        self.dropped = len(dates) - len(order)
+        self.column = column
+        self.frame = df.iloc[order].reset_index(drop=True)
+        self.frame[column] = dates[order]
+        self.dates = self.frame[column].to_numpy()
+
+        # Months since 1970-01 give every period code without touching the .dt accessors
+        # (int32, the dtype .dt.year / .dt.month / .dt.quarter return)
+        months = self.dates.astype("datetime64[M]").astype(np.int64)
+        self.year = (months // 12 + 1970).astype(np.int32)
+        self.month = (months % 12 + 1).astype(np.int32)
+        self.quarter = ((self.month - 1) // 3 + 1).astype(np.int32)
+        self._codes = {"Y": months // 12, "Q": months // 3, "M": months}
+
+    def __len__(self):
+        return len(self.dates)
+
+    def with_date_parts(self):
+        """The sorted sales with the Month, Year and Quarter columns the breakdowns group on"""
+        self.frame['Month'] = self.month
+        self.frame['Year'] = self.year
+        self.frame['Quarter'] = self.quarter
+        return self.frame
+
+    def range(self, start=None, end=None):
+        """Slice of the sales dated in [start, end); either bound may be left open"""
+        lo = 0 if start is None else np.searchsorted(self.dates, pd.Timestamp(start).to_datetime64(), side="left")
+        hi = len(self) if end is None else np.searchsorted(self.dates, pd.Timestamp(end).to_datetime64(), side="left")
+        return slice(int(lo), int(max(lo, hi)))
+
+    def between(self, start=None, end=None):
+        """Sales dated in [start, end), as a contiguous (zero-copy) block of rows"""
+        return self.frame.iloc[self.range(start, end)]
+
+    def last(self, days, end=None):
+        """Sales in the `days` days up to and including `end` (default: the latest sale)"""
+        end = pd.Timestamp(self.dates[-1] if end is None else end).normalize() + pd.Timedelta(days=1)
+        return self.between(end - pd.Timedelta(days=days), end)
+
+    def period(self, period):
+        """Sales in one calendar period: a pandas Period or a string such as "2022Q2", "2022-05" or "2022" """
+        period = period if isinstance(period, pd.Period) else pd.Period(period)
+        return self.between(period.start_time, period.end_time + pd.Timedelta(1, "ns"))
+
+    def period_runs(self, freq="M"):
+        """Start row and length of every non-empty period, in date order"""
+        codes = self._codes[freq]
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.empty(0, dtype=np.int64)
+        return starts, np.diff(np.r_[starts, len(codes)])
+
+    def period_means(self, column, freq="M"):
+        """Mean of `column` per period, indexed like groupby([dt.year, dt.month]) (or dt.quarter, or dt.year)"""
+        starts, lengths = self.period_runs(freq)
+        values = self.frame[column].to_numpy(dtype=np.float64)
+        means = np.add.reduceat(values, starts) / lengths if len(starts) else np.empty(0)
+        if freq == "Y":
+            index = pd.Index(self.year[starts], name=self.column)
+        else:
+            within = self.month[starts] if freq == "M" else self.quarter[starts]
+            index = pd.MultiIndex.from_arrays([self.year[starts], within], names=[self.column, self.column])
+        return pd.Series(means, index=index, name=column)
@@ -0,0 +1,90 @@
+import numpy as np
+
+# Number of swap-or-not rounds used to shuffle each block of the address space
+SHUFFLE_ROUNDS = 24
+
+def _mix(values):
+    """splitmix64 finalizer, used as the round function of the shuffle"""
+    values = values.astype(np.uint64, copy=True)
+    values ^= values >> np.uint64(30)
+    values *= np.uint64(0xBF58476D1CE4E5B9)
+    values ^= values >> np.uint64(27)
+    values *= np.uint64(0x94D049BB133111EB)
+    values ^= values >> np.uint64(31)
+    return values
+
+class AddressAllocator:
+    """Hand out unique addresses by sampling the (house number, street) space without replacement.
+
+    The space is split into blocks of `last_number - first_number + 1` house numbers times the
+    street names. Each block is shuffled by a keyed swap-or-not permutation, so the address at any
+    position is computed directly in O(1) with no retries. When a block is used up the allocator
+    moves on to the next range of house numbers, so the space grows with the dataset. The same
+    seed always gives the same sequence of addresses.
+    """
+
+    def __init__(self, streets, first_number=1000, last_number=3000, seed=42, reserved=()):
+        self.streets = np.asarray(streets)
+        self.first_number = first_number
+        self.block_width = last_number - first_number + 1
+        self.block_size = self.block_width * len(self.streets)
+        self.seed = seed
+        self.position = 0
+        self._block_keys = {}
+
+        # Positions of reserved addresses are skipped when mapping allocation indexes to positions
+        self._reserved_positions = np.sort(self._positions_of(reserved))
+
+    def _keys(self, block):
+        if block not in self._block_keys:
+            rng = np.random.default_rng([self.seed, block])
+            self._block_keys[block] = (rng.integers(0, self.block_size, size=SHUFFLE_ROUNDS, dtype=np.uint64),
+                                       rng.integers(0, 2**63, size=SHUFFLE_ROUNDS, dtype=np.uint64))
+        return self._block_keys[block]
+
+    def _shuffle(self, offsets, block, inverse=False):
+        # Each swap-or-not round is an involution, so the inverse runs the rounds backwards
+        offsets = offsets.astype(np.uint64, copy=True)
+        size = np.uint64(self.block_size)
+        partners, salts = self._keys(block)
+        rounds = range(SHUFFLE_ROUNDS - 1, -1, -1) if inverse else range(SHUFFLE_ROUNDS)
+        for r in rounds:
+            partner = (partners[r] + size - offsets) % size
+            swap = (_mix(np.maximum(offsets, partner) ^ salts[r]) & np.uint64(1)).astype(bool)
+            offsets = np.where(swap, partner, offsets)
+        return offsets.astype(np.int64)
+
+    def _positions_of(self, addresses):
+        # Reverse mapping from address strings to positions in the shuffled space
+        street_index = {street: i for i, street in enumerate(self.streets.tolist())}
+        positions = []
+        for address in addresses:
+            number, _, street = address.partition(" ")
+            if street not in street_index or not number.isdigit() or int(number) < self.first_number:
+                continue
+            block, row = divmod(int(number) - self.first_number, self.block_width)
+            slot = np.array([row * len(self.streets) + street_index[street]])
+            positions.append(block * self.block_size + int(self._shuffle(slot, block, inverse=True)[0]))
+        return np.array(positions, dtype=np.int64)
+
+    def addresses_at(self, indexes):
+        """Addresses for the given allocation indexes (random access, independent of the cursor)"""
+        positions = np.asarray(indexes, dtype=np.int64)
+        for reserved in self._reserved_positions:
+            positions = positions + (positions >= reserved)
+
+        blocks, offsets = np.divmod(positions, self.block_size)
+        slots = np.empty_like(offsets)
+        for block in np.unique(blocks):
+            in_block = blocks == block
+            slots[in_block] = self._shuffle(offsets[in_block], int(block))
+
+        rows, street_codes = np.divmod(slots, len(self.streets))
+        house_numbers = self.first_number + blocks * self.block_width + rows
+        return np.char.add(np.char.add(house_numbers.astype(str), " "), self.streets[street_codes])
+
+    def allocate(self, count):
+        """Next `count` unique addresses"""
+        addresses = self.addresses_at(np.arange(self.position, self.position + count))
+        self.position += count
+        return addresses
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+# Street suffixes are compared in their abbreviated form
+SUFFIX_ABBREVIATIONS = {
+    "STREET": "ST", "DRIVE": "DR", "AVENUE": "AVE", "ROAD": "RD", "LOOP": "LP",
+    "CIRCLE": "CIR", "HIGHWAY": "HWY", "PLACE": "PL", "LANE": "LN", "COURT": "CT",
+}
+
+def normalize_addresses(addresses):
+    """Upper-case, collapse whitespace and punctuation, and abbreviate street suffixes"""
+    normalized = (pd.Series(addresses, dtype=str)
+                  .str.upper()
+                  .str.replace(r"[.,#]", " ", regex=True)
+                  .str.replace(r"\s+", " ", regex=True)
+                  .str.strip())
+    pattern = r"\b(" + "|".join(SUFFIX_ABBREVIATIONS) + r")\b"
+    return normalized.str.replace(pattern, lambda match: SUFFIX_ABBREVIATIONS[match.group(1)], regex=True).to_numpy()
+
+class AddressIndex:
+    """Hash index from normalized address to the row positions of its sales (repeat sales included).
+
+    Row positions are stored grouped by address (CSR layout), so a batch of N queries is answered
+    with one hash lookup for all of them and one gather of the matching rows.
+    """
+
+    def __init__(self, df, column="Address"):
+        self.df = df
+        # Normalize each distinct spelling once, then merge spellings that normalize to the same key
+        raw_codes, raw_uniques = pd.factorize(df[column].to_numpy())
+        key_codes, uniques = pd.factorize(normalize_addresses(raw_uniques))
+        codes = key_codes[raw_codes]
+        self._keys = pd.Index(uniques)
+        self._positions = np.argsort(codes, kind="stable")
+        self._offsets = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(uniques)))])
+
+    def __len__(self):
+        return len(self._keys)
+
+    def positions(self, address):
+        """Row positions of every sale of one address"""
+        code = self._keys.get_indexer(normalize_addresses([address]))[0]
+        if code < 0:
+            return np.empty(0, dtype=np.int64)
+        return self._positions[self._offsets[code]:self._offsets[code + 1]]
+
+    def lookup(self, addresses, year=None, columns=("Address", "Sale Date", "Sale Price")):
+        """Sales of many addresses at once: one row per matching sale, with the queried address in 'Query'"""
+        queries = np.asarray(addresses, dtype=object)
+        codes = self._keys.get_indexer(normalize_addresses(queries))
+        found = codes >= 0
+        starts = self._offsets[codes[found]]
+        counts = self._offsets[codes[found] + 1] - starts
+
+        # Expand every [start, start + count) range of the CSR layout in one go
+        query_index = np.repeat(np.flatnonzero(found), counts)
+        within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        rows = self._positions[np.repeat(starts, counts) + within]
+
+        result = self.df.iloc[rows][list(columns)].reset_index(drop=True)
+        result.insert(0, "Query", queries[query_index])
+        if year is not None:
+            result = result[pd.to_datetime(result["Sale Date"]).dt.year.to_numpy() == year].reset_index(drop=True)
+        return result
+
+    def highest_sales(self, addresses, year=None):
+        """Highest sale of each queried address (in `year` if given), most expensive first"""
+        sales = self.lookup(addresses, year=year)
+        best = sales.loc[sales.groupby("Query", sort=False)["Sale Price"].idxmax()]
+        return best.sort_values("Sale Price", ascending=False, kind="stable").reset_index(drop=True)
@@ -0,0 +1,25 @@
+import argparse
+import time
+
+from generate_dataset import create_dataset, create_dataset_bulk
+
+# Compare rows/sec of the row-by-row generator against the vectorized bulk mode
+def benchmark(generator, num_properties, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        generator(num_properties)
+        best = min(best, time.perf_counter() - start)
+    return best, num_properties / best
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark create_dataset against create_dataset_bulk")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 40000])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    
+    print(f"{'Rows':>10}  {'Loop (rows/sec)':>16}  {'Bulk (rows/sec)':>16}  {'Speedup':>8}")
+    for size in args.sizes:
+        loop_time, loop_rate = benchmark(create_dataset, size, args.repeats)
+        bulk_time, bulk_rate = benchmark(create_dataset_bulk, size, args.repeats)
+        print(f"{size:>10,}  {loop_rate:>16,.0f}  {bulk_rate:>16,.0f}  {loop_time / bulk_time:>7.1f}x")
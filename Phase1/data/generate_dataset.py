@@ -3,6 +3,16 @@ import numpy as np
 import random
 from datetime import datetime, timedelta
 import os
+import sys
+import argparse
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from address_allocator import AddressAllocator
+from address_index import AddressIndex
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # Repository root
+from instrumentation import configure_tracing, stage
 
 # Set random seed for reproducibility
 np.random.seed(42)
@@ -17,6 +27,28 @@ street_names = [
     "Pukunui Street", "Puu Poni Street", "Moanalua Road", "Hoolana Street"
 ]
 
+# The two properties the task asks about are always included in the dataset
+required_properties = [
+    {
+        "Address": "2072 Akaikai Loop",
+        "Sale Date": datetime(2022, 6, 15),  # Random date in 2022
+        "Sale Price": 875000,  # Random price
+        "Square Footage": 1850,
+        "Bedrooms": 4,
+        "Bathrooms": 2.5,
+        "Year Built": 1985
+    },
+    {
+        "Address": "2017 Komo Mai Drive",
+        "Sale Date": datetime(2022, 9, 22),  # Random date in 2022
+        "Sale Price": 925000,  # Higher price for the second property
+        "Square Footage": 2100,
+        "Bedrooms": 4,
+        "Bathrooms": 3,
+        "Year Built": 1992
+    }
+]
+
 # Function to generate a random date between 2021-2023
 def random_date(start_date, end_date):
     time_between_dates = end_date - start_date
@@ -24,50 +56,20 @@ def random_date(start_date, end_date):
     random_number_of_days = random.randrange(days_between_dates)
     return start_date + timedelta(days=random_number_of_days)
 
-# Function to generate a random address
-def generate_address(existing_addresses):
-    while True:
-        house_number = random.randint(1000, 3000)
-        street = random.choice(street_names)
-        address = f"{house_number} {street}"
-        if address not in existing_addresses:
-            return address
-
 # Create dataset
 def create_dataset(num_properties=50):
     start_date = datetime(2021, 1, 1)
     end_date = datetime(2023, 12, 31)
     
-    # Ensure the two required properties are included
-    required_properties = [
-        {
-            "Address": "2072 Akaikai Loop",
-            "Sale Date": datetime(2022, 6, 15),  # Random date in 2022
-            "Sale Price": 875000,  # Random price
-            "Square Footage": 1850,
-            "Bedrooms": 4,
-            "Bathrooms": 2.5,
-            "Year Built": 1985
-        },
-        {
-            "Address": "2017 Komo Mai Drive",
-            "Sale Date": datetime(2022, 9, 22),  # Random date in 2022
-            "Sale Price": 925000,  # Higher price for the second property
-            "Square Footage": 2100,
-            "Bedrooms": 4,
-            "Bathrooms": 3,
-            "Year Built": 1992
-        }
-    ]
+    data = [dict(prop) for prop in required_properties]
     
-    data = required_properties.copy()
-    existing_addresses = {prop["Address"] for prop in required_properties}
+    # Unique addresses are sampled without replacement, skipping the required ones
+    address_allocator = AddressAllocator(street_names, seed=random.getrandbits(32),
+                                         reserved=[prop["Address"] for prop in required_properties])
+    addresses = address_allocator.allocate(max(0, num_properties - len(required_properties))).tolist()
     
     # Generate additional random properties
-    for _ in range(num_properties - len(required_properties)):
-        address = generate_address(existing_addresses)
-        existing_addresses.add(address)
-        
+    for address in addresses:
         sale_date = random_date(start_date, end_date)
         
         # Generate realistic property details
@@ -120,29 +122,194 @@ def create_dataset(num_properties=50):
     
     return df
 
-if __name__ == "__main__":
-    # Create dataset with at least 50 properties
-    df = create_dataset(55)  # Generate a few extra to ensure we have at least 50
+# Draw every column for a batch of properties with one Generator call per column
+def _draw_properties(rng, addresses, required=()):
+    num_random = len(addresses)
+    start_date = np.datetime64("2021-01-01")
+    days_between_dates = (np.datetime64("2023-12-31") - start_date).astype(int)
+    
+    # Same distributions and limits as the row-by-row generator
+    sale_dates = start_date + rng.integers(0, days_between_dates, size=num_random)
+    sale_prices = np.clip(rng.normal(800000, 300000/3, size=num_random).astype(np.int64), 500000, 1500000)
+    sqft = np.clip(rng.normal(1800, 500, size=num_random).astype(np.int64), 1000, 3500)
+    bedrooms = rng.choice([2, 3, 4, 5], size=num_random, p=[0.05, 0.4, 0.4, 0.15])
+    bathrooms = rng.choice([1, 1.5, 2, 2.5, 3, 3.5], size=num_random, p=[0.05, 0.15, 0.3, 0.3, 0.15, 0.05])
+    year_built = rng.integers(1960, 2016, size=num_random)
     
-    # Save to CSV
-    output_path = os.path.join(os.path.dirname(__file__), "pearl_city_home_sales.csv")
-    df.to_csv(output_path, index=False)
+    required = pd.DataFrame(list(required), columns=list(required_properties[0]))
+    df = pd.DataFrame({
+        "Address": np.concatenate([required["Address"].to_numpy(dtype=str), addresses]),
+        "Sale Date": np.concatenate([required["Sale Date"].to_numpy(dtype="datetime64[D]"), sale_dates]),
+        "Sale Price": np.concatenate([required["Sale Price"].to_numpy(dtype=np.int64), sale_prices]),
+        "Square Footage": np.concatenate([required["Square Footage"].to_numpy(dtype=np.int64), sqft]),
+        "Bedrooms": np.concatenate([required["Bedrooms"].to_numpy(dtype=np.int64), bedrooms]),
+        "Bathrooms": np.concatenate([required["Bathrooms"].to_numpy(dtype=float), bathrooms]),
+        "Year Built": np.concatenate([required["Year Built"].to_numpy(dtype=np.int64), year_built]),
+    })
     
-    print(f"Dataset created with {len(df)} properties and saved to {output_path}")
+    # Add the same additional features as create_dataset
+    num_rows = len(df)
+    df["Price per Sqft"] = (df["Sale Price"] / df["Square Footage"]).round(2)
+    df["Property Type"] = rng.choice(["Single Family", "Townhouse", "Condo"], size=num_rows, p=[0.7, 0.2, 0.1])
+    df["Lot Size (sqft)"] = (df["Square Footage"] * rng.uniform(1.5, 4, size=num_rows)).astype(int)
+    df["Has Pool"] = rng.choice([True, False], size=num_rows, p=[0.15, 0.85])
+    df["Has Garage"] = rng.choice([True, False], size=num_rows, p=[0.8, 0.2])
+    df["Garage Size"] = np.where(df["Has Garage"], rng.integers(1, 4, size=num_rows), 0)
     
-    # Find which of the two specified properties sold for more in 2022
-    property1 = df[df["Address"] == "2072 Akaikai Loop"]
-    property2 = df[df["Address"] == "2017 Komo Mai Drive"]
+    # Format the date
+    df["Sale Date"] = np.datetime_as_string(df["Sale Date"].to_numpy(dtype="datetime64[D]"), unit="D")
     
-    if not property1.empty and not property2.empty:
-        price1 = property1.iloc[0]["Sale Price"]
-        price2 = property2.iloc[0]["Sale Price"]
-        
-        higher_price_property = "2017 Komo Mai Drive" if price2 > price1 else "2072 Akaikai Loop"
-        higher_price = max(price1, price2)
+    return df
+
+# Generate rows [start, stop) of the dataset from the shard's own child seed; the required
+# properties are rows 0 to len(required_properties) - 1, random properties follow
+def _generate_shard(shard):
+    shard_index, start, stop, seed, shard_seed = shard
+    num_required = len(required_properties)
+    
+    # Every shard shares the allocator of the root seed and reads a disjoint range of it,
+    # so addresses stay unique across shards
+    address_allocator = AddressAllocator(street_names, seed=seed,
+                                         reserved=[prop["Address"] for prop in required_properties])
+    addresses = address_allocator.addresses_at(np.arange(max(start, num_required), max(stop, num_required)) - num_required)
+    return _draw_properties(np.random.default_rng(shard_seed), addresses, required_properties[start:stop])
+
+# Generate the dataset as a stream of fixed-size chunks (the first chunk starts with the required properties)
+def iter_dataset_chunks(num_properties=50, chunk_size=100000, seed=42, workers=1):
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    if workers is not None and workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    # The required properties are always included, even when num_properties is smaller
+    num_rows = max(num_properties, len(required_properties))
+    
+    # Shard boundaries depend only on the chunk size, never on the number of workers;
+    # the required rows are the first rows of the first chunk(s)
+    bounds = [(start, min(start + chunk_size, num_rows)) for start in range(0, num_rows, chunk_size)]
+    
+    # Each shard gets an independent child seed spawned from the root seed
+    shard_seeds = np.random.SeedSequence(seed).spawn(len(bounds))
+    shards = [(i, start, stop, seed, shard_seed) for i, ((start, stop), shard_seed) in enumerate(zip(bounds, shard_seeds))]
+    
+    if workers == 1:
+        for shard in shards:
+            yield _generate_shard(shard)
+        return
+    
+    # Keep a bounded number of shards in flight and yield them in order
+    max_in_flight = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for shard in shards:
+            pending.append(pool.submit(_generate_shard, shard))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+# Create dataset in bulk: every column is drawn with one batched Generator call per shard
+def create_dataset_bulk(num_properties=50, seed=42, workers=1, shard_size=100000):
+    return pd.concat(iter_dataset_chunks(num_properties, chunk_size=shard_size, seed=seed, workers=workers),
+                     ignore_index=True)
+
+# Append each chunk to a CSV file, or to a Parquet/Arrow dataset partitioned by sale year
+def write_dataset_stream(chunks, output_path, file_format="csv"):
+    num_rows = 0
+    if file_format == "csv":
+        with open(output_path, "w", newline="") as f:
+            for chunk in chunks:
+                chunk.to_csv(f, index=False, header=(num_rows == 0))
+                num_rows += len(chunk)
+        return num_rows
+    
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError(f"Writing {file_format} output requires pyarrow (pip install pyarrow)")
+    
+    # Keep one open writer per year so every chunk is appended rather than held in memory
+    writers = {}
+    try:
+        for chunk in chunks:
+            sale_years = chunk["Sale Date"].str[:4].astype(int)
+            for year, part in chunk.groupby(sale_years.to_numpy()):
+                table = pa.Table.from_pandas(part, preserve_index=False)
+                if year not in writers:
+                    partition_dir = os.path.join(output_path, f"sale_year={year}")
+                    os.makedirs(partition_dir, exist_ok=True)
+                    if file_format == "parquet":
+                        writers[year] = pq.ParquetWriter(os.path.join(partition_dir, "part-0.parquet"), table.schema)
+                    else:
+                        writers[year] = pa.ipc.new_file(os.path.join(partition_dir, "part-0.arrow"), table.schema)
+                writers[year].write_table(table)
+            num_rows += len(chunk)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return num_rows
+
+# Write which of the two specified properties sold for more in 2022
+def write_result(df):
+    addresses = [prop["Address"] for prop in required_properties]
+    highest = AddressIndex(df).highest_sales(addresses, year=2022)
+    
+    if len(highest) == len(addresses):
+        higher_price_property = highest.iloc[0]["Query"]
+        higher_price = int(highest.iloc[0]["Sale Price"])
         
-        result_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "result.txt")
+        result_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "result.txt")
         with open(result_path, "w") as f:
             f.write(f"The property at {higher_price_property} sold for more in 2022, with a sale price of ${higher_price:,}.")
         
-        print(f"Result saved to {result_path}")
\ No newline at end of file
+        print(f"Result saved to {result_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the Pearl City home sales dataset")
+    parser.add_argument("--num-properties", type=int, default=55)  # A few extra to ensure we have at least 50
+    parser.add_argument("--bulk", action="store_true", help="Use the vectorized generator (for large loads)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the vectorized generator")
+    parser.add_argument("--chunk-size", type=int, help="Stream the vectorized generator in chunks of this many rows")
+    parser.add_argument("--format", choices=["csv", "parquet", "arrow"], default="csv",
+                        help="Output format (parquet/arrow are partitioned by sale year)")
+    parser.add_argument("--output", help="Output file (csv) or directory (parquet/arrow)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Generate shards of the vectorized generator in this many processes")
+    parser.add_argument("--trace", help="Write per-stage timings and memory peaks to this Chrome trace file "
+                                        "(or set PERF_TRACE)")
+    args = parser.parse_args()
+    if args.chunk_size is not None and args.chunk_size <= 0:
+        parser.error("--chunk-size must be positive")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    configure_tracing(args.trace)
+    
+    default_name = "pearl_city_home_sales.csv" if args.format == "csv" else f"pearl_city_home_sales_{args.format}"
+    output_path = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), default_name)
+    
+    if args.chunk_size or args.format != "csv":
+        # Stream chunks to disk so peak memory does not grow with the number of properties
+        chunk_size = args.chunk_size or 100000
+        chunks = iter_dataset_chunks(args.num_properties, chunk_size=chunk_size, seed=args.seed, workers=args.workers)
+        with stage("generate and write", format=args.format):
+            # The leading chunks that hold the required properties are kept for result.txt
+            first_chunks = list(itertools.islice(chunks, -(-len(required_properties) // chunk_size)))
+            num_rows = write_dataset_stream(itertools.chain(first_chunks, chunks), output_path, args.format)
+        print(f"Dataset created with {num_rows} properties and saved to {output_path}")
+        with stage("write result"):
+            write_result(pd.concat(first_chunks, ignore_index=True))
+    else:
+        # Create dataset with at least 50 properties
+        with stage("generate", rows=args.num_properties):
+            if args.bulk or args.workers > 1:
+                df = create_dataset_bulk(args.num_properties, seed=args.seed, workers=args.workers)
+            else:
+                df = create_dataset(args.num_properties)
+        
+        # Save to CSV
+        with stage("write csv"):
+            df.to_csv(output_path, index=False)
+        
+        print(f"Dataset created with {len(df)} properties and saved to {output_path}")
+        with stage("write result"):
+            write_result(df)
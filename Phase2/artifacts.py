@@ -0,0 +1,129 @@
+import io
+import os
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+DEFAULT_WORKERS = 4
+
+def _create_temp(directory, name):
+    # Like tempfile.mkstemp, but created with mode 0o666 so the process umask applies as it
+    # does for a plain open(): the renamed artifact gets the usual permissions
+    while True:
+        temp_path = os.path.join(directory, f".{name}.{secrets.token_hex(4)}.tmp")
+        try:
+            os.close(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+            return temp_path
+        except FileExistsError:
+            continue
+
+def atomic_write(path, write):
+    """Write `path` through `write(temp_path)`, then rename it into place.
+
+    The temporary file sits next to the target, so the rename is atomic: readers see either the
+    previous file or the complete new one, never a partial write.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    temp_path = _create_temp(directory, os.path.basename(path))
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+class ArtifactWriter:
+    """Writes CSVs, figures and text reports under `output_dir` on a thread pool.
+
+    Every write is atomic (see atomic_write) and returns a Future. The caller keeps computing
+    while files are written: file I/O and compression release the GIL. Figures are rasterized on
+    the calling thread, since matplotlib is not thread-safe; PNG encoding of the pixels and the
+    write go to the pool. `close` (or
+    leaving the `with` block) waits for every write and re-raises the first failure.
+    """
+
+    def __init__(self, output_dir=".", workers=DEFAULT_WORKERS):
+        self.output_dir = output_dir
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="artifact-writer")
+        self.futures = {}
+        self.seconds = {}  # Write time of every finished artifact, by relative path
+
+    def path(self, relative):
+        return os.path.join(self.output_dir, relative)
+
+    def submit(self, relative, write):
+        """Write `relative` (under output_dir) with `write(temp_path)` in the background"""
+        path = self.path(relative)
+
+        def task():
+            start = time.perf_counter()
+            atomic_write(path, write)
+            self.seconds[relative] = time.perf_counter() - start
+            return path
+
+        self.futures[relative] = self.pool.submit(task)
+        return self.futures[relative]
+
+    def csv(self, relative, df, **kwargs):
+        return self.submit(relative, lambda path: df.to_csv(path, index=False, **kwargs))
+
+    def text(self, relative, content):
+        def write(path):
+            with open(path, "w") as f:
+                f.write(content)
+        return self.submit(relative, write)
+
+    def data(self, relative, content):
+        def write(path):
+            with open(path, "wb") as f:
+                f.write(content)
+        return self.submit(relative, write)
+
+    def figure(self, relative, fig, dpi=None, **kwargs):
+        """Rasterize a matplotlib figure now and encode and write it in the background; the figure is closed"""
+        import matplotlib as mpl
+        import matplotlib.pyplot as plt
+        fmt = os.path.splitext(relative)[1][1:].lower()
+        if fmt != "png":
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format=fmt, dpi=dpi, **kwargs)
+            plt.close(fig)
+            return self.data(relative, buffer.getvalue())
+
+        if dpi is None or dpi == "figure":
+            dpi = fig.dpi if mpl.rcParams["savefig.dpi"] == "figure" else mpl.rcParams["savefig.dpi"]
+        # The raw RGBA format runs the same Agg draw as PNG output (bbox_inches="tight" included)
+        # but no encoder; the canvas buffer it leaves has the pixels, copied before the figure closes
+        fig.savefig(io.BytesIO(), format="rgba", dpi=dpi, **kwargs)
+        pixels = np.array(fig.canvas.buffer_rgba())
+        plt.close(fig)
+        software = f"Matplotlib version{mpl.__version__}, https://matplotlib.org/"
+
+        def write(path):
+            # PNG compression releases the GIL, so it overlaps with drawing the next figure
+            from PIL import Image, PngImagePlugin
+            info = PngImagePlugin.PngInfo()
+            info.add_text("Software", software)
+            Image.fromarray(pixels, "RGBA").save(path, format="png", dpi=(dpi, dpi), pnginfo=info)
+        return self.submit(relative, write)
+
+    def wait(self, *relative):
+        """Wait for the given artifacts (default: all submitted so far); returns their paths"""
+        futures = [self.futures[name] for name in relative] if relative else list(self.futures.values())
+        return [future.result() for future in futures]
+
+    def close(self):
+        try:
+            self.wait()
+        finally:
+            self.pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
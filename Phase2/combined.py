@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+# Low-cardinality text columns, stored as codes into one dictionary shared by every show
+CATEGORICAL_COLUMNS = ["Show", "Winner_Gender", "Winner_Background", "Location", "Judges"]
+INTEGER_DTYPES = [pd.Int8Dtype(), pd.Int16Dtype(), pd.Int32Dtype(), pd.Int64Dtype()]
+
+def smallest_integer_dtype(columns):
+    """Narrowest nullable integer dtype holding every value of the given integer columns"""
+    low = min(int(column.min()) for column in columns)
+    high = max(int(column.max()) for column in columns)
+    for dtype in INTEGER_DTYPES:
+        info = np.iinfo(dtype.numpy_dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    raise ValueError(f"Values between {low} and {high} do not fit in 64 bits")
+
+def _shared_categorical(column, frames):
+    # Factorize each show once, then translate its small dictionary into the shared one
+    factorized = [pd.factorize(df[column]) if column in df.columns
+                  else (np.full(len(df), -1, dtype=np.int64), pd.Index([])) for df in frames.values()]
+    values = pd.unique(pd.concat([pd.Series(uniques) for _, uniques in factorized], ignore_index=True))
+    categories = pd.Index(values) if column == "Show" else pd.Index(values).sort_values()
+    codes = []
+    for show_codes, uniques in factorized:
+        lookup = np.append(categories.get_indexer(uniques), -1)  # code -1 stays missing
+        codes.append(lookup[show_codes])
+    dtype = pd.CategoricalDtype(categories)
+    return pd.Series(pd.Categorical.from_codes(np.concatenate(codes), dtype=dtype))
+
+def combine_shows(frames):
+    """All shows ({name: frame}) concatenated into one compact frame.
+
+    The schema is the union of the shows' columns, in order of first appearance:
+      - CATEGORICAL_COLUMNS share one dictionary across shows (the Show column keeps the order
+        the shows were given in, the others are sorted), so each row stores small integer codes
+      - integer columns use the narrowest nullable integer dtype that fits every show
+      - show-specific columns (Location, Judges, ...) are categorical too, so the rows of shows
+        without them cost one missing code each instead of a NaN object
+    Shows occupy contiguous row ranges, in the order given. The result is a new frame: the
+    columns are built (copied) once, straight into their compact dtypes.
+    """
+    columns = list(dict.fromkeys(column for df in frames.values() for column in df.columns))
+    data = {}
+    for column in columns:
+        present = [df[column] for df in frames.values() if column in df.columns]
+        if column in CATEGORICAL_COLUMNS:
+            data[column] = _shared_categorical(column, frames)
+            continue
+        if all(pd.api.types.is_integer_dtype(values) for values in present):
+            dtype = smallest_integer_dtype(present)
+        else:
+            dtype = present[0].dtype
+        # A column other shows lack is missing (NA) on their rows
+        parts = [df[column].astype(dtype) if column in df.columns
+                 else pd.Series(pd.NA, index=range(len(df)), dtype=dtype) for df in frames.values()]
+        data[column] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(data)
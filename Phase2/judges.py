@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+PANEL_SEPARATOR = ", "
+
+class JudgePanels:
+    """Season x judge relation, dictionary-encoded.
+
+    Each (season, judge) pair is a row of two integer code arrays: `season_codes` into `seasons`
+    and `judge_codes` into `judges`. Rows are grouped by season in panel order, so the panel
+    strings of the CSV format can be rebuilt exactly. An inverted index (CSR offsets into the
+    rows sorted by judge) answers judge -> seasons without scanning every panel.
+    """
+
+    def __init__(self, seasons, judges, season_codes, judge_codes):
+        self.seasons = np.asarray(seasons)
+        self.judges = np.asarray(judges, dtype=object)
+        self.season_codes = np.asarray(season_codes, dtype=np.int32)
+        self.judge_codes = np.asarray(judge_codes, dtype=np.int32)
+        order = np.argsort(self.judge_codes, kind="stable")
+        self._seasons_by_judge = self.season_codes[order]
+        self._offsets = np.concatenate([[0], np.cumsum(np.bincount(self.judge_codes, minlength=len(self.judges)))])
+        self._judge_index = {judge: code for code, judge in enumerate(self.judges)}
+
+    @classmethod
+    def from_strings(cls, seasons, panels, separator=PANEL_SEPARATOR):
+        """Relation from one panel string per season ("Simon Cowell, Paula Abdul, ...")"""
+        panel_codes, distinct = pd.factorize(pd.Series(panels), use_na_sentinel=False)
+        # Only the distinct panels (one per era) are split; seasons reuse their judge codes
+        split = [[] if pd.isna(panel) else str(panel).split(separator) for panel in distinct]
+        judges = pd.unique(pd.Series([judge for panel in split for judge in panel], dtype=object))
+        judge_index = {judge: code for code, judge in enumerate(judges)}
+        flat = np.array([judge_index[judge] for panel in split for judge in panel], dtype=np.int32)
+        panel_sizes = np.array([len(panel) for panel in split], dtype=np.int64)
+        panel_starts = np.concatenate([[0], np.cumsum(panel_sizes)[:-1]])
+        # Gather each season's panel out of `flat`: its start, then consecutive positions
+        sizes = panel_sizes[panel_codes]
+        season_codes = np.repeat(np.arange(len(panel_codes), dtype=np.int32), sizes)
+        row_starts = np.cumsum(sizes) - sizes
+        within = np.arange(sizes.sum()) - np.repeat(row_starts, sizes)
+        judge_codes = flat[np.repeat(panel_starts[panel_codes], sizes) + within]
+        return cls(np.asarray(seasons), judges, season_codes, judge_codes)
+
+    @classmethod
+    def from_frame(cls, df, season_column="Season", column="Judges"):
+        rows = df[df[column].notna()]
+        return cls.from_strings(rows[season_column].to_numpy(), rows[column].to_numpy(dtype=object))
+
+    @classmethod
+    def read_csv(cls, path, season_column="Season", column="Judges"):
+        return cls.from_frame(pd.read_csv(path, usecols=[season_column, column]), season_column, column)
+
+    def to_strings(self, separator=PANEL_SEPARATOR):
+        """One panel string per season, as stored in the show CSV"""
+        sizes = np.bincount(self.season_codes, minlength=len(self.seasons))
+        starts = np.cumsum(sizes) - sizes
+        names = self.judges[self.judge_codes]
+        # Append the k-th judge of every panel that has one, one column of judges at a time
+        strings = np.full(len(self.seasons), "", dtype=object)
+        for k in range(sizes.max(initial=0)):
+            has = sizes > k
+            strings[has] = (strings[has] + (separator if k else "")) + names[starts[has] + k]
+        return strings
+
+    def to_frame(self, season_column="Season", column="Judges"):
+        return pd.DataFrame({season_column: self.seasons, column: self.to_strings()})
+
+    def seasons_for(self, judge):
+        """Seasons the judge sat on, from the inverted index"""
+        code = self._judge_index[judge]
+        return self.seasons[self._seasons_by_judge[self._offsets[code]:self._offsets[code + 1]]]
+
+    def seasons_per_judge(self):
+        return pd.Series(np.diff(self._offsets), index=self.judges, name="Seasons")
+
+    def incidence(self, seasons=None):
+        """Boolean seasons x judges matrix, for the given seasons (default: every season)"""
+        matrix = np.zeros((len(self.seasons), len(self.judges)), dtype=bool)
+        matrix[self.season_codes, self.judge_codes] = True
+        if seasons is None:
+            return matrix
+        rows = pd.Index(self.seasons).get_indexer(seasons)
+        if (rows < 0).any():
+            raise KeyError(list(np.asarray(seasons)[rows < 0]))
+        return matrix[rows]
+
+    def panel_overlap(self, first, second=None):
+        """Judges shared by every season of `first` with every season of `second` (default `first`).
+
+        One product of incidence matrices, len(first) x len(second); use overlap_counts for
+        pairs of seasons taken in step.
+        """
+        second = first if second is None else second
+        shared = self.incidence(first).astype(np.int32) @ self.incidence(second).astype(np.int32).T
+        return pd.DataFrame(shared, index=pd.Index(first, name="Season"), columns=pd.Index(second, name="Season"))
+
+    def overlap_counts(self, first=None, second=None):
+        """Judges shared by each pair first[i], second[i] (default: each season and the next)"""
+        if first is None:
+            first, second = self.seasons[:-1], self.seasons[1:]
+        return (self.incidence(first) & self.incidence(second)).sum(axis=1)
+
+    def mean_by_judge(self, values):
+        """Mean of a per-season value (aligned with `seasons`) over each judge's seasons"""
+        values = np.asarray(values, dtype=np.float64)
+        totals = np.bincount(self.judge_codes, weights=values[self.season_codes], minlength=len(self.judges))
+        return pd.Series(totals / np.diff(self._offsets), index=self.judges)
+
+def viewership_by_judge(df, season_column="Season", column="Judges", value="Viewership_Millions"):
+    """Mean viewership of the seasons each judge sat on, highest first"""
+    panels = JudgePanels.from_frame(df, season_column, column)
+    values = df.set_index(season_column)[value].reindex(panels.seasons).to_numpy()
+    return panels.mean_by_judge(values).rename(value).sort_values(ascending=False)
@@ -0,0 +1,60 @@
+import string
+
+import numpy as np
+
+MIDDLE_INITIALS = np.array(list(string.ascii_uppercase))
+
+def load_vocabulary():
+    """First and last names from Faker's en_US person provider, as NumPy string arrays"""
+    from faker.providers.person.en_US import Provider
+    return np.array(sorted(set(Provider.first_names))), np.array(sorted(set(Provider.last_names)))
+
+class NameGenerator:
+    """Vectorized full-name generator over first/last name vocabularies.
+
+    Every name is a position in a fixed index space: first x last names ("Ann Smith"), followed
+    by first x middle initial x last names ("Ann B. Smith") once the plain combinations run out.
+    `unique` samples positions without replacement and decodes them with integer division, so
+    names never repeat and no draw is ever retried. All draws come from one seeded Generator.
+    """
+
+    def __init__(self, seed=42, first_names=None, last_names=None):
+        if first_names is None or last_names is None:
+            first_names, last_names = load_vocabulary()
+        self.first_names = np.asarray(first_names, dtype=str)
+        self.last_names = np.asarray(last_names, dtype=str)
+        self.rng = np.random.default_rng(seed)
+        self._first_with_space = np.char.add(self.first_names, " ")
+        self._initials_with_space = np.char.add(MIDDLE_INITIALS, ". ")
+        self.plain_capacity = len(self.first_names) * len(self.last_names)
+        self.capacity = self.plain_capacity * (1 + len(MIDDLE_INITIALS))
+
+    def decode(self, positions):
+        """Names at the given positions of the index space"""
+        positions = np.asarray(positions, dtype=np.int64)
+        plain = positions < self.plain_capacity
+        offsets = np.where(plain, positions, positions - self.plain_capacity)
+        first = self._first_with_space[(offsets // len(self.last_names)) % len(self.first_names)]
+        last = self.last_names[offsets % len(self.last_names)]
+        names = np.char.add(first, last).astype(object)
+        if not plain.all():
+            # Positions past the plain combinations carry a middle initial
+            extended = ~plain
+            initials = self._initials_with_space[offsets[extended] // self.plain_capacity]
+            names[extended] = np.char.add(np.char.add(first[extended], initials), last[extended])
+        return names
+
+    def unique(self, count):
+        """`count` distinct names, plain first/last combinations first"""
+        if count > self.capacity:
+            raise ValueError(f"Only {self.capacity:,} distinct names can be formed from this vocabulary")
+        num_plain = min(count, self.plain_capacity)
+        positions = self.rng.choice(self.plain_capacity, size=num_plain, replace=False)
+        if count > num_plain:
+            extra = self.rng.choice(self.capacity - self.plain_capacity, size=count - num_plain, replace=False)
+            positions = np.concatenate([positions, extra + self.plain_capacity])
+        return self.decode(positions)
+
+    def sample(self, count):
+        """`count` names drawn independently (repeats allowed)"""
+        return self.decode(self.rng.integers(0, self.plain_capacity, size=count))
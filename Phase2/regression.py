@@ -0,0 +1,46 @@
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+def t_quantile(p, dof):
+    """Student t quantile from the normal one (Cornish-Fisher expansion; within 0.2% for dof >= 5)"""
+    z = NormalDist().inv_cdf(p)
+    return (z + (z ** 3 + z) / (4 * dof) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * dof ** 2)
+            + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * dof ** 3))
+
+def ols_fit(x, y):
+    """Simple least-squares line of y on x, with what its confidence band needs"""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    x_mean, y_mean = x.mean(), y.mean()
+    sxx = ((x - x_mean) ** 2).sum()
+    slope = ((x - x_mean) * (y - y_mean)).sum() / sxx
+    intercept = y_mean - slope * x_mean
+    residuals = y - (intercept + slope * x)
+    return {"n": n, "x_mean": x_mean, "sxx": sxx, "slope": slope, "intercept": intercept,
+            "residual_var": (residuals ** 2).sum() / (n - 2), "x_min": x.min(), "x_max": x.max()}
+
+def ols_band(fit, grid, confidence=0.95):
+    """Fitted line over `grid` with the analytic confidence band of the mean response"""
+    grid = np.asarray(grid, dtype=np.float64)
+    yhat = fit["intercept"] + fit["slope"] * grid
+    se = np.sqrt(fit["residual_var"] * (1 / fit["n"] + (grid - fit["x_mean"]) ** 2 / fit["sxx"]))
+    half_width = t_quantile(0.5 + confidence / 2, fit["n"] - 2) * se
+    return yhat, yhat - half_width, yhat + half_width
+
+def grouped_mean_ci(df, x, y, hue, confidence=0.95):
+    """Mean of y at every x for each hue level, with a normal-approximation confidence interval.
+
+    Levels keep their order of appearance and x values are sorted, as seaborn's lineplot draws them.
+    Points with a single observation get no interval.
+    """
+    grouped = df.groupby([hue, x], sort=False)[y]
+    summary = grouped.agg(["mean", "std", "count"]).reset_index()
+    summary[hue] = pd.Categorical(summary[hue], categories=df[hue].unique())
+    summary = summary.sort_values([hue, x], kind="stable").reset_index(drop=True)
+    half_width = NormalDist().inv_cdf(0.5 + confidence / 2) * summary["std"] / np.sqrt(summary["count"])
+    summary["lower"] = summary["mean"] - half_width
+    summary["upper"] = summary["mean"] + half_width
+    return summary
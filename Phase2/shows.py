@@ -0,0 +1,155 @@
+import json
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from names import NameGenerator
+
+DEFAULT_SEED = 42
+
+# Declarative description of every show: what the generator draws for each season.
+#   viewership: piecewise linear base ("start" + "slope" * (season - "from") up to season "until"),
+#               plus uniform noise of +/- "noise", never below "floor"
+#   locations / panel_eras: the show-specific column, from a per-season list or from eras of seasons
+SHOW_SPECS = {
+    "Survivor": {
+        "seasons": 44,  # Up to season 44
+        "start_year": 2000,
+        "seasons_per_year": 2,  # Roughly 2 seasons per year
+        "tie_probability": 0.15,  # Some seasons have tied runners-up
+        "contestants": [16, 20],  # Varies but typically around 16-20
+        "viewership": {"segments": [{"until": None, "start": 20.0, "slope": -0.3, "from": 0}],
+                       "noise": 2.0, "floor": 5.0},
+        "winner_age": [21, 56],
+        "winner_gender": ["Male", "Female"],
+        "winner_background": ["Student", "Attorney", "Sales", "Medical", "Retired",
+                              "Teacher", "Military", "Finance", "Entertainment", "Technology"],
+        "locations": {
+            "column": "Location",
+            "names": [
+                "Borneo", "Australian Outback", "Africa", "Marquesas", "Thailand",
+                "Amazon", "Pearl Islands", "All-Stars", "Vanuatu", "Palau",
+                "Guatemala", "Panama", "Cook Islands", "Fiji", "China",
+                "Micronesia", "Gabon", "Tocantins", "Samoa", "Heroes vs. Villains",
+                "Nicaragua", "Redemption Island", "South Pacific", "One World", "Philippines",
+                "Caramoan", "Blood vs. Water", "Cagayan", "San Juan del Sur", "Worlds Apart",
+                "Cambodia", "Kaôh Rōng", "Millennials vs. Gen X", "Game Changers", "Heroes v. Healers v. Hustlers",
+                "Ghost Island", "David vs. Goliath", "Edge of Extinction", "Island of the Idols", "Winners at War",
+                "Fiji (41)", "Fiji (42)", "Fiji (43)", "Fiji (44)",
+            ],
+            "default": "Fiji ({season})",
+        },
+    },
+    "American Idol": {
+        "seasons": 21,  # American Idol had 21 seasons by the time Survivor reached 44
+        "start_year": 2002,
+        "seasons_per_year": 1,
+        "tie_probability": 0.0,
+        "contestants": [20, 36],  # Usually starts with top 24, 30, or 36
+        # High in early seasons, declining more slowly after season 10
+        "viewership": {"segments": [{"until": 10, "start": 30.0, "slope": -1.5, "from": 0},
+                                    {"until": None, "start": 15.0, "slope": -0.5, "from": 10}],
+                       "noise": 2.0, "floor": 3.0},
+        "winner_age": [16, 30],  # Idol winners tend to be younger
+        "winner_gender": ["Male", "Female"],
+        "winner_background": ["Student", "Waitress/Waiter", "Retail", "Unemployed",
+                              "Bar Singer", "Church Singer", "Music Teacher", "Street Performer"],
+        "panel_eras": {
+            "column": "Judges",
+            "eras": [
+                {"until": 7, "panel": ["Simon Cowell", "Paula Abdul", "Randy Jackson"]},
+                {"until": 8, "panel": ["Simon Cowell", "Paula Abdul", "Randy Jackson", "Kara DioGuardi"]},
+                {"until": 9, "panel": ["Ellen DeGeneres", "Simon Cowell", "Randy Jackson", "Kara DioGuardi"]},
+                {"until": 11, "panel": ["Jennifer Lopez", "Steven Tyler", "Randy Jackson"]},
+                {"until": 12, "panel": ["Mariah Carey", "Nicki Minaj", "Randy Jackson", "Keith Urban"]},
+                {"until": 15, "panel": ["Jennifer Lopez", "Keith Urban", "Harry Connick Jr."]},
+                {"until": None, "panel": ["Katy Perry", "Luke Bryan", "Lionel Richie"]},
+            ],
+        },
+    },
+}
+
+def load_show_specs(path):
+    """Show specs from a JSON file shaped like SHOW_SPECS"""
+    with open(path) as f:
+        return json.load(f)
+
+def show_seed(seed, name):
+    # Depends only on the root seed and the show's name, not on which other shows are generated
+    return [seed, zlib.crc32(name.encode())]
+
+def _era_index(seasons, eras):
+    # Index of the first era whose "until" is at or after each season; an open-ended era comes last
+    untils = np.array([np.inf if era["until"] is None else era["until"] for era in eras])
+    return np.searchsorted(untils, seasons, side="left")
+
+def _viewership(rng, seasons, model):
+    segments = model["segments"]
+    segment = _era_index(seasons, segments)
+    start = np.array([s["start"] for s in segments])[segment]
+    slope = np.array([s["slope"] for s in segments])[segment]
+    origin = np.array([s["from"] for s in segments])[segment]
+    base = start + slope * (seasons - origin)
+    noise = rng.uniform(-model["noise"], model["noise"], size=len(seasons))
+    return np.round(np.maximum(model["floor"], base + noise), 2)
+
+def generate_show(name, spec, seed=DEFAULT_SEED):
+    """Generate one show from its spec; returns (DataFrame, number of unique winners)"""
+    seasons = np.arange(1, spec["seasons"] + 1)
+    num_seasons = len(seasons)
+    rng = np.random.default_rng(show_seed(seed, name))
+    names = NameGenerator(seed=show_seed(seed, name) + [1])
+
+    # Winners are unique by construction; runners-up may repeat, and some seasons have two
+    winners = names.unique(num_seasons)
+    runner_ups = names.sample(2 * num_seasons).reshape(num_seasons, 2)
+    tied = rng.random(num_seasons) < spec["tie_probability"]
+    runner_up = np.where(tied, runner_ups[:, 0] + ", " + runner_ups[:, 1], runner_ups[:, 0])
+
+    columns = {
+        "Season": seasons,
+        "Year_Aired": spec["start_year"] + (seasons - 1) // spec["seasons_per_year"],
+        "Winner": winners,
+        "Runner_Up": runner_up,
+    }
+    if "locations" in spec:
+        locations = spec["locations"]
+        listed = [locations["names"][season - 1] if season <= len(locations["names"])
+                  else locations["default"].format(season=season) for season in seasons]
+        columns[locations["column"]] = listed
+    if "panel_eras" in spec:
+        eras = spec["panel_eras"]["eras"]
+        panels = np.array([", ".join(era["panel"]) for era in eras], dtype=object)
+        columns[spec["panel_eras"]["column"]] = panels[_era_index(seasons, eras)]
+
+    low, high = spec["contestants"]
+    columns["Number_of_Contestants"] = rng.integers(low, high + 1, size=num_seasons)
+    columns["Viewership_Millions"] = _viewership(rng, seasons, spec["viewership"])
+    columns["Show"] = name
+    # Demographics for analysis
+    low, high = spec["winner_age"]
+    columns["Winner_Age"] = rng.integers(low, high + 1, size=num_seasons)
+    columns["Winner_Gender"] = rng.choice(np.array(spec["winner_gender"], dtype=object), size=num_seasons)
+    columns["Winner_Background"] = rng.choice(np.array(spec["winner_background"], dtype=object), size=num_seasons)
+
+    return pd.DataFrame(columns), len(pd.unique(winners))
+
+def generate_shows(specs=SHOW_SPECS, seed=DEFAULT_SEED, workers=1):
+    """Generate every show in `specs`, one process per show when `workers` > 1.
+
+    Each show draws from its own seed, so the output is identical for any number of workers.
+    Returns {name: (DataFrame, number of unique winners)}.
+    """
+    names = list(specs)
+    if workers == 1 or len(names) <= 1:
+        results = [generate_show(name, specs[name], seed) for name in names]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(generate_show, names, [specs[name] for name in names], [seed] * len(names)))
+    return dict(zip(names, results))
+
+def data_file_name(show):
+    """CSV file name of a show's data ("American Idol" -> "american_idol_data.csv")"""
+    return f"{show.lower().replace(' ', '_')}_data.csv"
@@ -1,292 +1,276 @@
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import random
-from faker import Faker
 import os
+import sys
+import argparse
+import io
+import time
+from contextlib import contextmanager
 from datetime import datetime
 
-# Set random seed for reproducibility
-random.seed(42)
-np.random.seed(42)
-fake = Faker()
-Faker.seed(42)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Repository root
+from instrumentation import configure_tracing, stage
 
-# Create directories if they don't exist
-os.makedirs('data', exist_ok=True)
-os.makedirs('results', exist_ok=True)
-os.makedirs('visualizations', exist_ok=True)
+from trends import TrendEngine
+from shows import SHOW_SPECS, data_file_name, generate_show, generate_shows, load_show_specs
+from artifacts import DEFAULT_WORKERS, ArtifactWriter
+from combined import combine_shows
+from distinct import count_csv, format_result
+from judges import JudgePanels, viewership_by_judge
+from regression import grouped_mean_ci, ols_band, ols_fit
 
-def generate_survivor_data():
-    """Generate dataset for Survivor"""
-    seasons = 44  # Up to season 44
-    
-    # Locations for Survivor seasons
-    locations = [
-        "Borneo", "Australian Outback", "Africa", "Marquesas", "Thailand",
-        "Amazon", "Pearl Islands", "All-Stars", "Vanuatu", "Palau",
-        "Guatemala", "Panama", "Cook Islands", "Fiji", "China",
-        "Micronesia", "Gabon", "Tocantins", "Samoa", "Heroes vs. Villains",
-        "Nicaragua", "Redemption Island", "South Pacific", "One World", "Philippines",
-        "Caramoan", "Blood vs. Water", "Cagayan", "San Juan del Sur", "Worlds Apart",
-        "Cambodia", "Kaôh Rōng", "Millennials vs. Gen X", "Game Changers", "Heroes v. Healers v. Hustlers",
-        "Ghost Island", "David vs. Goliath", "Edge of Extinction", "Island of the Idols", "Winners at War",
-        "Fiji (41)", "Fiji (42)", "Fiji (43)", "Fiji (44)"
-    ]
-    
-    # Generate basic season data
-    data = []
-    start_year = 2000
-    unique_winners = set()  # Track unique winners
-    
-    for season in range(1, seasons + 1):
-        year_aired = start_year + ((season - 1) // 2)  # Roughly 2 seasons per year
-        
-        # Generate winner name (ensure it's unique)
-        winner_name = fake.name()
-        while winner_name in unique_winners:
-            winner_name = fake.name()
-        unique_winners.add(winner_name)
-        
-        # Generate runner-up(s)
-        if random.random() < 0.85:  # Most seasons have 1 runner-up
-            runner_ups = fake.name()
-        else:  # Some seasons have tied runners-up
-            runner_ups = f"{fake.name()}, {fake.name()}"
-        
-        # Number of contestants varies but typically around 16-20
-        num_contestants = random.randint(16, 20)
-        
-        # Viewership (in millions) - trending downward over time
-        base_viewership = 20.0 - (0.3 * season)
-        viewership = max(5.0, base_viewership + random.uniform(-2.0, 2.0))
-        viewership = round(viewership, 2)
-        
-        location = locations[season-1] if season <= len(locations) else f"Fiji ({season})"
-        
-        data.append({
-            "Season": season,
-            "Year_Aired": year_aired,
-            "Winner": winner_name,
-            "Runner_Up": runner_ups,
-            "Location": location,
-            "Number_of_Contestants": num_contestants,
-            "Viewership_Millions": viewership,
-            "Show": "Survivor",
-            # Demographics for analysis
-            "Winner_Age": random.randint(21, 56),
-            "Winner_Gender": random.choice(["Male", "Female"]),
-            "Winner_Background": random.choice([
-                "Student", "Attorney", "Sales", "Medical", "Retired",
-                "Teacher", "Military", "Finance", "Entertainment", "Technology"
-            ])
-        })
-    
-    return pd.DataFrame(data), len(unique_winners)
+# Viewership trend state kept between runs (see trends.TrendEngine)
+TREND_STATE = os.path.join("results", "viewership_trends.json")
 
-def generate_idol_data():
+def generate_survivor_data(seasons=44):
+    """Generate dataset for Survivor (up to season 44 by default)"""
+    return generate_show("Survivor", dict(SHOW_SPECS["Survivor"], seasons=seasons))
+
+def generate_idol_data(seasons=21):
     """Generate dataset for American Idol"""
-    seasons = 21  # American Idol had 21 seasons by the time Survivor reached 44
+    # American Idol had 21 seasons by the time Survivor reached 44
+    return generate_show("American Idol", dict(SHOW_SPECS["American Idol"], seasons=seasons))
+
+def draw_mean_lines(ax, data, x, y, hue):
+    """Fast stand-in for sns.lineplot: mean line and analytic 95% band per hue level, no bootstrap"""
+    summary = grouped_mean_ci(data, x, y, hue)
+    for level, group in summary.groupby(hue, observed=True, sort=False):
+        line, = ax.plot(group[x], group["mean"], marker='o', markeredgecolor='w', markeredgewidth=0.75, label=level)
+        ax.fill_between(group[x], group["lower"], group["upper"], color=line.get_color(), alpha=0.2, linewidth=0)
+    ax.legend(title=hue)
+
+def draw_regression(ax, x, y, fit=None, color="C0"):
+    """Scatter with the OLS line and its analytic 95% band of the mean (drawn like sns.regplot).
+
+    `fit` is a line in ols_fit's format, such as a TrendEngine fit; by default it is fitted to x, y.
+    `color` defaults to the first color of the palette, which sns.regplot uses on a fresh axes.
+    """
+    import matplotlib as mpl
+    if fit is None:
+        fit = ols_fit(x, y)
+    grid = np.linspace(fit["x_min"], fit["x_max"], 100)
+    yhat, lower, upper = ols_band(fit, grid)
+    ax.scatter(x, y, color=color, alpha=0.8, linewidths=mpl.rcParams["lines.markeredgewidth"])
+    ax.plot(grid, yhat, color=color, linewidth=mpl.rcParams["lines.linewidth"] * 1.5)
+    ax.fill_between(grid, lower, upper, facecolor=color, alpha=0.15)
+
+def analyze_and_visualize(survivor_df, idol_df, survivor_unique, idol_unique, plots=True, fast=False,
+                          writer=None, trends=None):
+    """Analyze and visualize the data (numbers only when `plots` is False).
+
+    With `fast`, the trend figures are drawn from analytic intervals instead of seaborn's
+    bootstrapped ones. The regression figure always draws the overall lines of `trends` (a
+    TrendEngine, fitted here when not given). Files go through `writer` (an ArtifactWriter), which
+    writes them in the background; without one, a writer for the working directory is used and
+    waited for before returning.
+    """
+    if writer is None:
+        with ArtifactWriter() as writer:
+            return analyze_and_visualize(survivor_df, idol_df, survivor_unique, idol_unique, plots, fast, writer,
+                                         trends)
     
-    # Judges throughout American Idol history
-    all_judges = [
-        "Simon Cowell", "Paula Abdul", "Randy Jackson", "Kara DioGuardi",
-        "Ellen DeGeneres", "Jennifer Lopez", "Steven Tyler", "Mariah Carey",
-        "Nicki Minaj", "Keith Urban", "Harry Connick Jr.", "Lionel Richie",
-        "Katy Perry", "Luke Bryan"
-    ]
+    # Combine dataframes for some visualizations (shared categorical dictionaries, compact dtypes)
+    combined_df = combine_shows({"Survivor": survivor_df, "American Idol": idol_df})
     
-    # Judge configurations by era
-    judge_eras = [
-        ["Simon Cowell", "Paula Abdul", "Randy Jackson"],  # Early seasons
-        ["Simon Cowell", "Paula Abdul", "Randy Jackson", "Kara DioGuardi"],  # Season 8
-        ["Ellen DeGeneres", "Simon Cowell", "Randy Jackson", "Kara DioGuardi"],  # Season 9
-        ["Jennifer Lopez", "Steven Tyler", "Randy Jackson"],  # Seasons 10-11
-        ["Mariah Carey", "Nicki Minaj", "Randy Jackson", "Keith Urban"],  # Season 12
-        ["Jennifer Lopez", "Keith Urban", "Harry Connick Jr."],  # Seasons 13-15
-        ["Katy Perry", "Luke Bryan", "Lionel Richie"]  # Seasons 16+
-    ]
+    # 1. Calculate and save the difference in unique winners
+    with stage("write result"):
+        writer.text("results/result.txt", format_result({"Survivor": survivor_unique, "American Idol": idol_unique}))
     
-    data = []
-    start_year = 2002
-    unique_winners = set()
+    if not plots:
+        return combined_df
     
-    for season in range(1, seasons + 1):
-        year_aired = start_year + (season - 1)
-        
-        # Generate winner name (ensure it's unique)
-        winner_name = fake.name()
-        while winner_name in unique_winners:
-            winner_name = fake.name()
-        unique_winners.add(winner_name)
-        
-        runner_up = fake.name()
-        
-        # Select judges based on season
-        if season <= 7:
-            judges = ", ".join(judge_eras[0])
-        elif season == 8:
-            judges = ", ".join(judge_eras[1])
-        elif season == 9:
-            judges = ", ".join(judge_eras[2])
-        elif season <= 11:
-            judges = ", ".join(judge_eras[3])
-        elif season == 12:
-            judges = ", ".join(judge_eras[4])
-        elif season <= 15:
-            judges = ", ".join(judge_eras[5])
-        else:
-            judges = ", ".join(judge_eras[6])
-        
-        # Number of contestants
-        num_contestants = random.randint(20, 36)  # Usually starts with top 24, 30, or 36
-        
-        # Viewership (in millions) - high in early seasons, declining over time
-        if season <= 10:
-            base_viewership = 30.0 - (season * 1.5)
-        else:
-            base_viewership = 15.0 - ((season - 10) * 0.5)
-        
-        viewership = max(3.0, base_viewership + random.uniform(-2.0, 2.0))
-        viewership = round(viewership, 2)
-        
-        data.append({
-            "Season": season,
-            "Year_Aired": year_aired,
-            "Winner": winner_name,
-            "Runner_Up": runner_up,
-            "Judges": judges,
-            "Number_of_Contestants": num_contestants,
-            "Viewership_Millions": viewership,
-            "Show": "American Idol",
-            # Demographics for analysis
-            "Winner_Age": random.randint(16, 30),  # Idol winners tend to be younger
-            "Winner_Gender": random.choice(["Male", "Female"]),
-            "Winner_Background": random.choice([
-                "Student", "Waitress/Waiter", "Retail", "Unemployed", 
-                "Bar Singer", "Church Singer", "Music Teacher", "Street Performer"
-            ])
-        })
+    # Plotting libraries are only imported when figures are drawn
+    import matplotlib.pyplot as plt
+    import seaborn as sns
     
-    return pd.DataFrame(data), len(unique_winners)
-
-def analyze_and_visualize(survivor_df, idol_df, survivor_unique, idol_unique):
-    """Analyze and visualize the data"""
-    # Combine dataframes for some visualizations
-    combined_df = pd.concat([survivor_df, idol_df])
+    # Wall time of building and rendering every figure; the writer only writes the PNG bytes
+    render_times = {}
     
-    # 1. Calculate and save the difference in unique winners
-    difference = survivor_unique - idol_unique
-    with open('results/result.txt', 'w') as f:
-        f.write(f"Survivor unique winners: {survivor_unique}\n")
-        f.write(f"American Idol unique winners: {idol_unique}\n")
-        f.write(f"Difference (Survivor - American Idol): {difference}\n")
+    @contextmanager
+    def figure(name):
+        start = time.perf_counter()
+        with stage(f"figure: {name}", fast=fast):
+            yield
+            writer.figure(f"visualizations/{name}.png", plt.gcf(), dpi=300, bbox_inches="tight")
+        render_times[name] = time.perf_counter() - start
     
     # 2. Demographics of winners - Age Distribution
-    plt.figure(figsize=(12, 8))
-    sns.boxplot(x="Show", y="Winner_Age", data=combined_df)
-    plt.title("Age Distribution of Winners by Show", fontsize=16)
-    plt.savefig("visualizations/winner_age_distribution.png", dpi=300, bbox_inches="tight")
+    with figure("winner_age_distribution"):
+        plt.figure(figsize=(12, 8))
+        sns.boxplot(x="Show", y="Winner_Age", data=combined_df)
+        plt.title("Age Distribution of Winners by Show", fontsize=16)
     
     # 3. Demographics - Gender Distribution
-    plt.figure(figsize=(10, 6))
-    gender_counts = combined_df.groupby(['Show', 'Winner_Gender']).size().unstack()
-    gender_counts.plot(kind='bar', stacked=True)
-    plt.title("Gender Distribution of Winners", fontsize=16)
-    plt.xlabel("Show")
-    plt.ylabel("Count")
-    plt.legend(title="Gender")
-    plt.savefig("visualizations/winner_gender_distribution.png", dpi=300, bbox_inches="tight")
+    with figure("winner_gender_distribution"):
+        plt.figure(figsize=(10, 6))
+        gender_counts = combined_df.groupby(['Show', 'Winner_Gender']).size().unstack()
+        gender_counts.plot(kind='bar', stacked=True)
+        plt.title("Gender Distribution of Winners", fontsize=16)
+        plt.xlabel("Show")
+        plt.ylabel("Count")
+        plt.legend(title="Gender")
     
     # 4. Demographics - Background Distribution
-    plt.figure(figsize=(14, 10))
-    background_data = combined_df.groupby(['Show', 'Winner_Background']).size().reset_index(name='Count')
-    sns.barplot(x="Winner_Background", y="Count", hue="Show", data=background_data)
-    plt.title("Background Distribution of Winners", fontsize=16)
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    plt.savefig("visualizations/winner_background_distribution.png", dpi=300, bbox_inches="tight")
+    with figure("winner_background_distribution"):
+        plt.figure(figsize=(14, 10))
+        background_data = combined_df.groupby(['Show', 'Winner_Background']).size().reset_index(name='Count')
+        # One count per bar, so there is no interval to estimate
+        sns.barplot(x="Winner_Background", y="Count", hue="Show", data=background_data,
+                    **({"errorbar": None} if fast else {}))
+        plt.title("Background Distribution of Winners", fontsize=16)
+        plt.xticks(rotation=45, ha='right')
+        plt.tight_layout()
     
     # 5. Viewership trends over time
-    plt.figure(figsize=(15, 8))
-    sns.lineplot(x="Year_Aired", y="Viewership_Millions", hue="Show", data=combined_df, marker='o')
-    plt.title("Viewership Trends Over Time", fontsize=16)
-    plt.xlabel("Year")
-    plt.ylabel("Viewership (Millions)")
-    plt.grid(True, linestyle='--', alpha=0.7)
-    plt.savefig("visualizations/viewership_trends.png", dpi=300, bbox_inches="tight")
+    with figure("viewership_trends"):
+        plt.figure(figsize=(15, 8))
+        if fast:
+            draw_mean_lines(plt.gca(), combined_df, "Year_Aired", "Viewership_Millions", "Show")
+        else:
+            sns.lineplot(x="Year_Aired", y="Viewership_Millions", hue="Show", data=combined_df, marker='o')
+        plt.title("Viewership Trends Over Time", fontsize=16)
+        plt.xlabel("Year")
+        plt.ylabel("Viewership (Millions)")
+        plt.grid(True, linestyle='--', alpha=0.7)
     
     # 6. Number of Contestants Over Time
-    plt.figure(figsize=(15, 8))
-    sns.lineplot(x="Year_Aired", y="Number_of_Contestants", hue="Show", data=combined_df, marker='o')
-    plt.title("Number of Contestants Over Time", fontsize=16)
-    plt.xlabel("Year")
-    plt.ylabel("Number of Contestants")
-    plt.grid(True, linestyle='--', alpha=0.7)
-    plt.savefig("visualizations/contestant_count_trends.png", dpi=300, bbox_inches="tight")
+    with figure("contestant_count_trends"):
+        plt.figure(figsize=(15, 8))
+        if fast:
+            draw_mean_lines(plt.gca(), combined_df, "Year_Aired", "Number_of_Contestants", "Show")
+        else:
+            sns.lineplot(x="Year_Aired", y="Number_of_Contestants", hue="Show", data=combined_df, marker='o')
+        plt.title("Number of Contestants Over Time", fontsize=16)
+        plt.xlabel("Year")
+        plt.ylabel("Number of Contestants")
+        plt.grid(True, linestyle='--', alpha=0.7)
     
     # 7. Show Evolution Analysis - Changes in viewership by season
-    fig, axes = plt.subplots(1, 2, figsize=(16, 7))
+    with figure("viewership_regression_by_show"):
+        fig, axes = plt.subplots(1, 2, figsize=(16, 7))
     
-    # Survivor
-    sns.regplot(x="Season", y="Viewership_Millions", data=survivor_df, ax=axes[0])
-    axes[0].set_title("Survivor: Viewership Decline by Season", fontsize=14)
-    axes[0].set_xlabel("Season Number")
-    axes[0].set_ylabel("Viewership (Millions)")
+        if trends is None:
+            trends = TrendEngine()
+            trends.update_from_frame("Survivor", survivor_df)
+            trends.update_from_frame("American Idol", idol_df)
     
-    # American Idol
-    sns.regplot(x="Season", y="Viewership_Millions", data=idol_df, ax=axes[1])
-    axes[1].set_title("American Idol: Viewership Decline by Season", fontsize=14)
-    axes[1].set_xlabel("Season Number")
-    axes[1].set_ylabel("Viewership (Millions)")
+        # Survivor
+        draw_regression(axes[0], survivor_df["Season"], survivor_df["Viewership_Millions"], trends.fit("Survivor"))
+        axes[0].set_title("Survivor: Viewership Decline by Season", fontsize=14)
+        axes[0].set_xlabel("Season Number")
+        axes[0].set_ylabel("Viewership (Millions)")
     
-    plt.tight_layout()
-    plt.savefig("visualizations/viewership_regression_by_show.png", dpi=300, bbox_inches="tight")
+        # American Idol
+        draw_regression(axes[1], idol_df["Season"], idol_df["Viewership_Millions"], trends.fit("American Idol"))
+        axes[1].set_title("American Idol: Viewership Decline by Season", fontsize=14)
+        axes[1].set_xlabel("Season Number")
+        axes[1].set_ylabel("Viewership (Millions)")
+    
+        plt.tight_layout()
+    
+    print("Figure build and render times (files are written by the artifact writer):")
+    for name, seconds in render_times.items():
+        print(f"  {name + '.png':<40}{seconds * 1000:>8.0f} ms")
     
     # Return the combined dataframe for further analysis
     return combined_df
 
-def main():
-    """Main function to generate data and run analysis"""
-    print("Generating Survivor data...")
-    survivor_df, survivor_unique = generate_survivor_data()
+def trend_summary(trends, show):
+    """Evolution-report line with a show's overall, recent (exponentially weighted) and rolling trends"""
+    overall = trends.fit(show)
+    rolling = trends.fit(show, "rolling")
+    return (f"- Viewership trend: {overall['slope']:+.2f}M per season overall, "
+            f"{trends.fit(show, 'exponential')['slope']:+.2f}M recently (exponentially weighted), "
+            f"{rolling['slope']:+.2f}M over seasons {rolling['x_min']:.0f}-{rolling['x_max']:.0f}\n")
+
+def main(plots=True, specs=SHOW_SPECS, workers=1, fast=False, distinct=None, output_dir=".",
+         write_workers=DEFAULT_WORKERS):
+    """Main function to generate data and run analysis.
+
+    Every show in `specs` is generated and saved to data/, but the analysis, result.txt and the
+    evolution report compare Survivor and American Idol only; other shows are output-only.
+    With `distinct` ("exact", "hll" or "auto"), unique winners are recounted from the saved CSV
+    files instead of taken from the generators. Every file is written atomically under
+    `output_dir` by `write_workers` background threads, overlapping with the analysis.
+    """
+    writer = ArtifactWriter(output_dir, write_workers)
+    
+    print(f"Generating data for {', '.join(specs)}...")
+    with stage("generate shows", shows=len(specs)):
+        shows = generate_shows(specs, workers=workers)
+    survivor_df, survivor_unique = shows["Survivor"]
+    idol_df, idol_unique = shows["American Idol"]
+    extra_shows = [show for show in shows if show not in ("Survivor", "American Idol")]
+    if extra_shows:
+        print(f"Not analyzed (data only): {', '.join(extra_shows)}")
     
-    print("Generating American Idol data...")
-    idol_df, idol_unique = generate_idol_data()
+    # Only seasons aired since the last run update the stored trends
+    with stage("update trends"):
+        trends = TrendEngine.load(writer.path(TREND_STATE))
+        new_seasons = {show: trends.update_from_frame(show, show_df) for show, (show_df, _) in shows.items()}
+    print("New seasons in the viewership trends: "
+          + ", ".join(f"{show} {count}" for show, count in new_seasons.items()))
     
     # Save raw data to CSV
-    survivor_df.to_csv("data/survivor_data.csv", index=False)
-    idol_df.to_csv("data/american_idol_data.csv", index=False)
+    for show, (show_df, _) in shows.items():
+        writer.csv(os.path.join("data", data_file_name(show)), show_df)
+    
+    if distinct:
+        with stage("count distinct winners", mode=distinct):
+            survivor_csv, idol_csv = writer.wait(os.path.join("data", data_file_name("Survivor")),
+                                                 os.path.join("data", data_file_name("American Idol")))
+            survivor_unique = count_csv(survivor_csv, mode=distinct).count()
+            idol_unique = count_csv(idol_csv, mode=distinct).count()
     
     print("Analyzing and visualizing data...")
-    combined_df = analyze_and_visualize(survivor_df, idol_df, survivor_unique, idol_unique)
-    combined_df.to_csv("data/combined_tv_shows_data.csv", index=False)
+    with stage("analyze and visualize"):
+        combined_df = analyze_and_visualize(survivor_df, idol_df, survivor_unique, idol_unique, plots=plots, fast=fast,
+                                            writer=writer, trends=trends)
+    writer.csv("data/combined_tv_shows_data.csv", combined_df)
     
     print("\n--- Analysis Results ---")
     print(f"Survivor unique winners: {survivor_unique}")
     print(f"American Idol unique winners: {idol_unique}")
     print(f"Difference (Survivor - American Idol): {survivor_unique - idol_unique}")
     
+    def location(relative):
+        return os.path.normpath(writer.path(relative))
+    
     print("\nAnalysis complete! Files saved:")
-    print("- Raw data saved in 'data/' folder")
-    print("- Visualizations saved in 'visualizations/' folder")
-    print("- Results saved in 'results/result.txt'")
+    print(f"- Raw data saved in '{location('data')}/' folder")
+    if plots:
+        print(f"- Visualizations saved in '{location('visualizations')}/' folder")
+    print(f"- Results saved in '{location('results/result.txt')}'")
     
     # Additional text analysis of how both shows have evolved
-    with open('results/show_evolution_analysis.txt', 'w') as f:
+    with io.StringIO() as f:
         f.write("Analysis of How Both Shows Have Evolved Over Time\n")
         f.write("===============================================\n\n")
         
         f.write("Survivor Evolution:\n")
         f.write("- Started with higher viewership that gradually declined over time\n")
+        f.write(trend_summary(trends, "Survivor"))
         f.write("- Contestant count has remained relatively stable\n")
         f.write("- Locations were varied initially but settled primarily in Fiji in later seasons\n")
         f.write("- Winner demographics show diversity across age, gender, and professional backgrounds\n\n")
         
         f.write("American Idol Evolution:\n")
         f.write("- Began with massive viewership that dramatically declined\n")
-        f.write("- Has gone through multiple judge configurations\n") 
+        f.write(trend_summary(trends, "American Idol"))
+        panels = JudgePanels.from_frame(idol_df)
+        seasons_per_judge = panels.seasons_per_judge()
+        longest = panels.seasons_for(seasons_per_judge.idxmax())
+        f.write(f"- Has gone through multiple judge configurations ({len(seasons_per_judge)} judges; "
+                f"{seasons_per_judge.idxmax()} sat on the most panels, {len(longest)} seasons "
+                f"from season {longest.min()} to {longest.max()})\n")
+        sizes = np.bincount(panels.season_codes, minlength=len(panels.seasons))
+        kept = panels.overlap_counts()
+        changes = int(((kept < sizes[:-1]) | (kept < sizes[1:])).sum())
+        first, latest = panels.seasons[0], panels.seasons[-1]
+        shared = panels.panel_overlap([first], [latest]).iloc[0, 0]
+        by_judge = viewership_by_judge(idol_df)
+        f.write(f"- The panel changed between {changes} of {len(kept)} consecutive seasons, and season {latest}'s "
+                f"panel shares {shared} judges with season {first}'s; seasons judged by {by_judge.index[0]} "
+                f"averaged the most viewers ({by_judge.iloc[0]:.1f}M)\n")
         f.write("- Contestant pool size has fluctuated more than Survivor\n")
         f.write("- Winner demographics skew younger with backgrounds more focused in musical fields\n\n")
         
@@ -295,8 +279,37 @@ def main():
         f.write("- Survivor has maintained more format consistency than American Idol\n")
         f.write("- American Idol has undergone more significant production changes including network change\n")
         f.write("- Survivor has had more consistent leadership with Jeff Probst as host throughout all seasons\n")
-        
-    print("- Show evolution analysis saved in 'results/show_evolution_analysis.txt'")
+        writer.text("results/show_evolution_analysis.txt", f.getvalue())
+    writer.text(TREND_STATE, trends.to_json())
+    
+    with stage("write artifacts"):
+        writer.close()
+    print(f"- Show evolution analysis saved in '{location('results/show_evolution_analysis.txt')}'")
+    print("Artifact write times (background):")
+    for relative, seconds in sorted(writer.seconds.items()):
+        print(f"  {relative:<48}{seconds * 1000:>8.0f} ms")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate and analyze the Survivor and American Idol datasets")
+    parser.add_argument("--no-plots", action="store_true",
+                        help="Numbers only: write the data and results without importing the plotting libraries")
+    parser.add_argument("--specs", help="JSON file of show specs (same shape as shows.SHOW_SPECS). A spec named "
+                                        "like a built-in show overrides it; other shows are generated and saved "
+                                        "to data/ but not analyzed")
+    parser.add_argument("--workers", type=int, default=1, help="Generate the shows in this many processes")
+    parser.add_argument("--fast-render", action="store_true",
+                        help="Draw the trend figures from analytic intervals instead of bootstrapping")
+    parser.add_argument("--distinct", choices=["exact", "hll", "auto"],
+                        help="Recount unique winners from the saved CSV files (exact set or HyperLogLog sketch)")
+    parser.add_argument("--output-dir", default=".", help="Write data/, results/ and visualizations/ under this directory")
+    parser.add_argument("--write-workers", type=int, default=DEFAULT_WORKERS,
+                        help="Threads encoding and writing the CSVs, figures and reports")
+    parser.add_argument("--trace", help="Write per-stage timings and memory peaks to this Chrome trace file "
+                                        "(or set PERF_TRACE)")
+    args = parser.parse_args()
+    configure_tracing(args.trace)
+    specs = SHOW_SPECS
+    if args.specs:
+        specs = {**SHOW_SPECS, **load_show_specs(args.specs)}
+    main(plots=not args.no_plots, specs=specs, workers=args.workers, fast=args.fast_render,
+         distinct=args.distinct, output_dir=args.output_dir, write_workers=args.write_workers)
\ No newline at end of file
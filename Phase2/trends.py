@@ -0,0 +1,203 @@
+import hashlib
+import json
+import math
+import os
+from collections import deque
+
+import numpy as np
+
+# Trend models kept for every show: all seasons, recent seasons weighted up, the last few seasons only
+TREND_VARIANTS = {
+    "overall": {},
+    "exponential": {"halflife": 5},  # A season's weight halves every 5 seasons
+    "rolling": {"window": 10},
+}
+
+class OnlineTrend:
+    """Least-squares line of y on x kept as running (weighted) means and co-moments.
+
+    A new point updates the slope, intercept and residual variance in O(1), without revisiting
+    earlier points. With `halflife`, older points decay exponentially; with `window`, only the
+    last `window` points count (the oldest is subtracted out as a new one arrives).
+    """
+
+    def __init__(self, halflife=None, window=None):
+        if halflife and window:
+            raise ValueError("Use either halflife or window, not both")
+        self.halflife = halflife
+        self.window = window
+        self.decay = 0.5 ** (1 / halflife) if halflife else 1.0
+        self.points = deque() if window else None
+        self._reset()
+
+    def _reset(self):
+        self.count = 0
+        self.weight = self.weight_sq = 0.0
+        self.mean_x = self.mean_y = 0.0
+        self.cxx = self.cxy = self.cyy = 0.0
+        self.x_min, self.x_max = math.inf, -math.inf
+        if self.points is not None:
+            self.points.clear()
+
+    def _merge(self, weights, x, y):
+        # Combine the running moments with those of a weighted batch (Chan et al. pairwise update)
+        batch_weight = weights.sum()
+        batch_x = (weights * x).sum() / batch_weight
+        batch_y = (weights * y).sum() / batch_weight
+        dx, dy = x - batch_x, y - batch_y
+        total = self.weight + batch_weight
+        shift_x, shift_y = batch_x - self.mean_x, batch_y - self.mean_y
+        between = self.weight * batch_weight / total
+        self.cxx += (weights * dx * dx).sum() + between * shift_x * shift_x
+        self.cxy += (weights * dx * dy).sum() + between * shift_x * shift_y
+        self.cyy += (weights * dy * dy).sum() + between * shift_y * shift_y
+        self.mean_x += batch_weight / total * shift_x
+        self.mean_y += batch_weight / total * shift_y
+        self.weight = total
+        self.weight_sq += (weights * weights).sum()
+
+    def _remove(self, x, y):
+        # Inverse of adding one unit-weight point
+        total = self.weight - 1
+        if total <= 0:
+            self.weight = self.weight_sq = self.mean_x = self.mean_y = self.cxx = self.cxy = self.cyy = 0.0
+            return
+        dx, dy = x - self.mean_x, y - self.mean_y
+        self.mean_x -= dx / total
+        self.mean_y -= dy / total
+        self.cxx -= dx * (x - self.mean_x)
+        self.cxy -= dx * (y - self.mean_y)
+        self.cyy -= dy * (y - self.mean_y)
+        self.weight = total
+        self.weight_sq -= 1
+
+    def update(self, x, y):
+        """Add points in order (scalars or arrays); O(1) per point"""
+        x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+        y = np.atleast_1d(np.asarray(y, dtype=np.float64))
+        if not len(x):
+            return self
+        if self.window and len(x) >= self.window:
+            # Nothing before the last `window` points survives
+            self._reset()
+            x, y = x[-self.window:], y[-self.window:]
+        if self.decay != 1.0:
+            scale = self.decay ** len(x)
+            self.weight *= scale
+            self.weight_sq *= scale * scale
+            self.cxx *= scale
+            self.cxy *= scale
+            self.cyy *= scale
+            weights = self.decay ** np.arange(len(x) - 1, -1, -1, dtype=np.float64)
+        else:
+            weights = np.ones(len(x))
+        self._merge(weights, x, y)
+        self.count += len(x)
+        self.x_min, self.x_max = min(self.x_min, x.min()), max(self.x_max, x.max())
+        if self.window:
+            self.points.extend(zip(x.tolist(), y.tolist()))
+            while len(self.points) > self.window:
+                self._remove(*self.points.popleft())
+                self.count -= 1
+            self.x_min = min(point[0] for point in self.points)
+            self.x_max = max(point[0] for point in self.points)
+        return self
+
+    @property
+    def slope(self):
+        return self.cxy / self.cxx if self.cxx > 0 else math.nan
+
+    @property
+    def intercept(self):
+        return self.mean_y - self.slope * self.mean_x
+
+    def fit(self):
+        """The line in regression.ols_fit's format (n is the effective sample size when weighted)"""
+        n = self.weight ** 2 / self.weight_sq if self.weight_sq else 0.0
+        residual_ss = max(self.cyy - self.cxy * self.slope, 0.0) if self.cxx > 0 else math.nan
+        return {"n": n, "x_mean": self.mean_x, "sxx": self.cxx, "slope": self.slope, "intercept": self.intercept,
+                "residual_var": residual_ss / (n - 2) if n > 2 else math.nan,
+                "x_min": self.x_min, "x_max": self.x_max}
+
+    def to_dict(self):
+        state = {key: getattr(self, key) for key in ("halflife", "window", "count", "weight", "weight_sq",
+                                                     "mean_x", "mean_y", "cxx", "cxy", "cyy", "x_min", "x_max")}
+        state["points"] = list(self.points) if self.points is not None else None
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        trend = cls(state["halflife"], state["window"])
+        for key, value in state.items():
+            if key not in ("halflife", "window", "points"):
+                setattr(trend, key, value)
+        if state["points"] is not None:
+            trend.points.extend(tuple(point) for point in state["points"])
+        return trend
+
+class TrendEngine:
+    """Online viewership trends per show, persisted between runs.
+
+    Every show keeps one OnlineTrend per variant, the number of seasons folded in and a checksum
+    of those seasons and their values. Feeding a show's frame again only adds the seasons after
+    them; if the checksum no longer matches the frame's first seasons (an earlier season was
+    edited, or the show was regenerated with other specs), the show is refit from scratch.
+    """
+
+    def __init__(self, variants=TREND_VARIANTS):
+        self.variants = variants
+        self.shows = {}
+
+    def _new_models(self):
+        return {name: OnlineTrend(**options) for name, options in self.variants.items()}
+
+    @staticmethod
+    def _checksum(seasons, values):
+        return hashlib.sha256(np.column_stack([seasons, values]).tobytes()).hexdigest()
+
+    def update_from_frame(self, show, df, x="Season", y="Viewership_Millions"):
+        """Add the seasons of `df` not seen yet; returns how many were added"""
+        df = df.sort_values(x)
+        seasons, values = df[x].to_numpy(dtype=np.float64), df[y].to_numpy(dtype=np.float64)
+        state = self.shows.get(show)
+        seen = state["seen"] if state is not None else 0
+        if state is None or seen > len(seasons) or self._checksum(seasons[:seen], values[:seen]) != state["checksum"]:
+            # Rebuild: nothing was folded in yet, or the seasons already folded in have changed
+            seen = 0
+            state = self.shows[show] = {"seen": 0, "checksum": self._checksum(seasons[:0], values[:0]),
+                                        "models": self._new_models()}
+        if seen < len(seasons):
+            for model in state["models"].values():
+                model.update(seasons[seen:], values[seen:])
+            state["seen"] = len(seasons)
+            state["checksum"] = self._checksum(seasons, values)
+        return len(seasons) - seen
+
+    def fit(self, show, variant="overall"):
+        return self.shows[show]["models"][variant].fit()
+
+    def to_json(self):
+        return json.dumps({show: {"seen": state["seen"], "checksum": state["checksum"],
+                                  "models": {name: model.to_dict() for name, model in state["models"].items()}}
+                           for show, state in self.shows.items()}, indent=1)
+
+    @classmethod
+    def from_json(cls, text, variants=TREND_VARIANTS):
+        engine = cls(variants)
+        for show, state in json.loads(text).items():
+            models = {name: OnlineTrend.from_dict(model) for name, model in state["models"].items()}
+            # Shows stored with other variant settings, or without a checksum (older state files),
+            # are dropped and refit on the next update
+            if "checksum" in state and set(models) == set(variants) and all(
+                    (models[name].halflife, models[name].window) == (options.get("halflife"), options.get("window"))
+                    for name, options in variants.items()):
+                engine.shows[show] = {"seen": state["seen"], "checksum": state["checksum"], "models": models}
+        return engine
+
+    @classmethod
+    def load(cls, path, variants=TREND_VARIANTS):
+        """Engine stored at `path`, or an empty one if there is none yet"""
+        if not os.path.exists(path):
+            return cls(variants)
+        with open(path) as f:
+            return cls.from_json(f.read(), variants)
@@ -0,0 +1,59 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name -> (source directory, module, arguments of the headless summary/result run)
+TARGETS = {
+    "home_sales_analysis": (os.path.join(ROOT, "Phase1", "analysis"), "home_sales_analysis", ["--no-plots"]),
+    "generate_dataset": (os.path.join(ROOT, "Phase1", "data"), "generate_dataset", None),
+    "task_2": (os.path.join(ROOT, "Phase2"), "task_2", ["--no-plots"]),
+}
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+def measure_import(source_dir, module, workdir):
+    """Wall time of a cold interpreter importing `module`, and its heaviest top-level imports"""
+    code = f"import sys; sys.path.insert(0, {source_dir!r}); import {module}"
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=workdir,
+                            capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+
+    # Direct imports are indented by one level below the module itself
+    cumulative = {}
+    for self_us, cumulative_us, indent, name in IMPORT_LINE.findall(result.stderr):
+        if len(indent) <= 3:
+            cumulative[name] = cumulative.get(name, 0) + int(cumulative_us)
+    return wall, sorted(cumulative.items(), key=lambda item: -item[1])
+
+def measure_run(source_dir, module, args, workdir):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(source_dir, f"{module}.py"), *args], cwd=workdir,
+                   capture_output=True, check=True)
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of the analysis scripts")
+    parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument("--repeats", type=int, default=5, help="Cold starts per target; the fastest is kept")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest imports listed per target")
+    parser.add_argument("--run", action="store_true", help="Also time the headless (numbers-only) run end to end")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="import_time_") as workdir:
+        for name in args.targets:
+            source_dir, module, run_args = TARGETS[name]
+            runs = [measure_import(source_dir, module, workdir) for _ in range(args.repeats)]
+            wall, heaviest = min(runs, key=lambda run: run[0])
+            print(f"{name}: {wall * 1000:.0f} ms cold start (interpreter + imports)")
+            for imported, cumulative_us in heaviest[:args.top]:
+                print(f"    {imported:<28}{cumulative_us / 1000:>8.1f} ms")
+            if args.run and run_args is not None:
+                run_wall = min(measure_run(source_dir, module, run_args, workdir) for _ in range(args.repeats))
+                print(f"    headless run ({' '.join(run_args)}): {run_wall * 1000:.0f} ms")
@@ -0,0 +1,207 @@
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_DIRS = [os.path.join(ROOT, "Phase1", "data"), os.path.join(ROOT, "Phase1", "analysis"), os.path.join(ROOT, "Phase2")]
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+HISTORY_PATH = os.path.join(RESULTS_DIR, "history.jsonl")
+BASELINE_PATH = os.path.join(RESULTS_DIR, "baseline.json")
+
+DEFAULT_SIZES = [100, 10000, 1000000]
+# Largest size run for the stages that do not scale: the per-row generator and the
+# seaborn-bootstrapped figures (about 190 s at 10,000 seasons)
+MAX_SIZES = {
+    "phase1.create_dataset": 100000,
+    "phase2.analyze_and_visualize": 1000,
+}
+BOOTSTRAP_REPLICATES = 200  # Fixed, so the bootstrap stage times the same work at every size
+DEFAULT_THRESHOLD = 0.2  # Flag a stage that got 20% slower or bigger than its baseline
+
+# Each stage takes (size, workdir), does its setup and returns the call to time.
+# Sizes are rows for Phase 1 and seasons per show for Phase 2.
+def stage_create_dataset(size, workdir):
+    from generate_dataset import create_dataset
+    return lambda: create_dataset(size)
+
+def stage_create_dataset_bulk(size, workdir):
+    from generate_dataset import create_dataset_bulk
+    return lambda: create_dataset_bulk(size)
+
+def _sales_csv(size, workdir):
+    from generate_dataset import create_dataset_bulk
+    data_path = os.path.join(workdir, f"sales_{size}.csv")
+    create_dataset_bulk(size).to_csv(data_path, index=False)
+    return data_path
+
+def _sales_index(size):
+    from generate_dataset import create_dataset_bulk
+    from time_index import SalesTimeIndex
+    return SalesTimeIndex(create_dataset_bulk(size))
+
+def stage_home_sales_analysis(size, workdir):
+    # The numbers only: charts and the bootstrap have stages of their own, and without the columnar
+    # cache every repeat parses the CSV instead of the first one writing what the others read
+    import home_sales_analysis
+    data_path = _sales_csv(size, workdir)
+    return lambda: home_sales_analysis.main([data_path], plots=False, bootstrap=0, cache=False)
+
+def stage_roi_bootstrap(size, workdir):
+    import home_sales_analysis
+    df = _sales_index(size).with_date_parts()
+    improvements = home_sales_analysis.analyze_improvements(home_sales_analysis.compute_tables(df))
+    return lambda: home_sales_analysis.compute_roi_intervals(df, improvements, replicates=BOOTSTRAP_REPLICATES)
+
+def stage_home_sales_plots(size, workdir):
+    import home_sales_analysis
+    from plotting import render_plots
+    sales = _sales_index(size)
+    df = sales.with_date_parts()
+    seasonality = home_sales_analysis.analyze_seasonality(home_sales_analysis.compute_tables(df))
+    jobs = (home_sales_analysis.price_overview_plots(sales) + home_sales_analysis.seasonality_plots(seasonality['monthly_sales'])
+            + home_sales_analysis.feature_impact_plots(df))
+    # A new directory every run, so the plot cache never skips a chart
+    return lambda: render_plots(jobs, tempfile.mkdtemp(dir=workdir), workers=1)
+
+def stage_generate_survivor_data(size, workdir):
+    import task_2
+    return lambda: task_2.generate_survivor_data(seasons=size)
+
+def stage_generate_idol_data(size, workdir):
+    import task_2
+    return lambda: task_2.generate_idol_data(seasons=size)
+
+def stage_analyze_and_visualize(size, workdir):
+    import task_2
+    survivor_df, survivor_unique = task_2.generate_survivor_data(seasons=size)
+    idol_df, idol_unique = task_2.generate_idol_data(seasons=size)
+    return lambda: task_2.analyze_and_visualize(survivor_df, idol_df, survivor_unique, idol_unique)
+
+STAGES = {
+    "phase1.create_dataset": stage_create_dataset,
+    "phase1.create_dataset_bulk": stage_create_dataset_bulk,
+    "phase1.home_sales_analysis": stage_home_sales_analysis,
+    "phase1.roi_bootstrap": stage_roi_bootstrap,
+    "phase1.home_sales_plots": stage_home_sales_plots,
+    "phase2.generate_survivor_data": stage_generate_survivor_data,
+    "phase2.generate_idol_data": stage_generate_idol_data,
+    "phase2.analyze_and_visualize": stage_analyze_and_visualize,
+}
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+def _run_case(stage, size, repeats):
+    # Runs in a fresh process, so imports, caches and peak RSS start clean for every case
+    with tempfile.TemporaryDirectory(prefix="bench_") as workdir:
+        os.chdir(workdir)  # task_2 writes its data/results/visualizations folders into the working directory
+        sys.path[:0] = SOURCE_DIRS
+        with redirect_stdout(io.StringIO()):
+            run = STAGES[stage](size, workdir)
+            times = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                run()
+                times.append(time.perf_counter() - start)
+    wall = min(times)
+    return {"stage": stage, "size": size, "repeats": repeats, "wall_s": wall,
+            "peak_rss_mb": _peak_rss_mb(), "throughput": size / wall}
+
+def run_case(stage, size, repeats=1):
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(_run_case, stage, size, repeats).result()
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def append_history(records, path=HISTORY_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    run_info = {"timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"), "commit": _git_commit(),
+                "machine": platform.node(), "python": platform.python_version()}
+    with open(path, "a") as f:
+        for record in records:
+            f.write(json.dumps({**run_info, **record}) + "\n")
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_baseline(records, path=BASELINE_PATH):
+    # Merge into the existing baseline so a partial run only replaces the cases it measured
+    baseline = load_baseline(path)
+    for record in records:
+        baseline[f"{record['stage']}@{record['size']}"] = {"wall_s": record["wall_s"], "peak_rss_mb": record["peak_rss_mb"]}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+def find_regressions(record, baseline, threshold=DEFAULT_THRESHOLD):
+    """Metrics of `record` that exceed its baseline by more than `threshold`, as {metric: ratio}"""
+    reference = baseline.get(f"{record['stage']}@{record['size']}")
+    if not reference:
+        return {}
+    regressions = {}
+    for metric in ("wall_s", "peak_rss_mb"):
+        if record[metric] and reference.get(metric) and record[metric] > reference[metric] * (1 + threshold):
+            regressions[metric] = record[metric] / reference[metric]
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark every stage of both phases across dataset sizes")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Rows (Phase 1) or seasons (Phase 2)")
+    parser.add_argument("--repeats", type=int, default=1, help="Timed runs per case; the fastest is kept")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown or memory growth reported as a regression")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--history", default=HISTORY_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--no-size-cap", action="store_true", help="Also run sizes above a stage's MAX_SIZES entry")
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    records = []
+    regressed = False
+    print(f"{'Stage':<32}{'Size':>10}{'Wall (s)':>11}{'Peak RSS (MB)':>15}{'Throughput (/s)':>17}  Regressions")
+    for stage in args.stages:
+        for size in args.sizes:
+            if size > MAX_SIZES.get(stage, size) and not args.no_size_cap:
+                print(f"{stage:<32}{size:>10,}  skipped (above {MAX_SIZES[stage]:,}; --no-size-cap runs it)")
+                continue
+            record = run_case(stage, size, args.repeats)
+            records.append(record)
+            regressions = find_regressions(record, baseline, args.threshold)
+            regressed = regressed or bool(regressions)
+            flags = ", ".join(f"{metric} x{ratio:.2f}" for metric, ratio in regressions.items())
+            peak = f"{record['peak_rss_mb']:.1f}" if record["peak_rss_mb"] is not None else "n/a"
+            print(f"{stage:<32}{size:>10,}{record['wall_s']:>11.3f}{peak:>15}{record['throughput']:>17,.0f}  {flags}")
+
+    append_history(records, args.history)
+    if args.save_baseline:
+        save_baseline(records, args.baseline)
+    print(f"\nHistory appended to {args.history}")
+    sys.exit(1 if regressed else 0)
@@ -0,0 +1,127 @@
+"""Per-stage timing and memory instrumentation shared by the Phase 1 and Phase 2 scripts.
+
+Wrap a named stage with `with stage("load sales"):` (or use `@stage("...")` as a decorator). Nothing
+is recorded until tracing is switched on, either with a script's `--trace PATH` flag or by setting the
+PERF_TRACE environment variable to an output path. Each stage then records its wall time, CPU time and
+tracemalloc peak. At exit everything is written as a Chrome trace-event JSON file, which can be opened
+in chrome://tracing or Perfetto, or compared across runs with `python instrumentation.py OLD NEW`.
+"""
+import argparse
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+ENV_VAR = "PERF_TRACE"
+
+class Tracer:
+    def __init__(self):
+        self.events = []
+        self.path = None
+        self._stack = []
+        self._origin = time.perf_counter_ns()
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def enable(self, path):
+        if self.enabled:
+            self.path = path
+            return
+        self.path = path
+        self._origin = time.perf_counter_ns()
+        tracemalloc.start()
+        atexit.register(self.write)
+
+    @contextmanager
+    def stage(self, name, **args):
+        if not self.enabled:
+            yield
+            return
+        # tracemalloc only has one peak counter: fold it into the enclosing stage before resetting it
+        if self._stack:
+            self._stack[-1]["peak"] = max(self._stack[-1]["peak"], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        frame = {"peak": 0}
+        memory_start = tracemalloc.get_traced_memory()[0]
+        self._stack.append(frame)
+        wall_start = time.perf_counter_ns()
+        cpu_start = time.process_time_ns()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter_ns() - wall_start
+            cpu = time.process_time_ns() - cpu_start
+            peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+            self.events.append({
+                "name": name, "cat": "stage", "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+                "ts": (wall_start - self._origin) / 1000, "dur": wall / 1000,
+                "args": {"cpu_ms": cpu / 1e6, "wall_ms": wall / 1e6, "tracemalloc_peak_mb": peak / 1e6,
+                         "tracemalloc_start_mb": memory_start / 1e6, **args},
+            })
+
+    def write(self, path=None):
+        path = path or self.path
+        if not path or not self.events:
+            return
+        trace = {"traceEvents": sorted(self.events, key=lambda event: event["ts"]), "displayTimeUnit": "ms",
+                 "otherData": {"argv": sys.argv, "python": sys.version.split()[0]}}
+        with open(path, "w") as f:
+            json.dump(trace, f, indent=1)
+        print(f"Stage trace written to {path}", file=sys.stderr)
+
+tracer = Tracer()
+
+def stage(name, **args):
+    """Context manager (or decorator) recording one named stage when tracing is on"""
+    return tracer.stage(name, **args)
+
+def configure_tracing(trace_path=None):
+    """Switch tracing on if a trace path is given, falling back to the PERF_TRACE environment variable"""
+    path = trace_path or os.environ.get(ENV_VAR)
+    if path:
+        tracer.enable(os.path.abspath(path))
+    return tracer.enabled
+
+def stage_totals(path):
+    """Total wall time, CPU time and largest tracemalloc peak per stage name in a trace file"""
+    with open(path) as f:
+        events = json.load(f)["traceEvents"]
+    totals = {}
+    for event in events:
+        total = totals.setdefault(event["name"], {"wall_ms": 0.0, "cpu_ms": 0.0, "tracemalloc_peak_mb": 0.0})
+        total["wall_ms"] += event["args"]["wall_ms"]
+        total["cpu_ms"] += event["args"]["cpu_ms"]
+        total["tracemalloc_peak_mb"] = max(total["tracemalloc_peak_mb"], event["args"]["tracemalloc_peak_mb"])
+    return totals
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize a stage trace, or compare two of them")
+    parser.add_argument("traces", nargs="+", help="One trace, or a baseline trace followed by a new one")
+    args = parser.parse_args()
+
+    totals = [stage_totals(path) for path in args.traces[:2]]
+    names = list(dict.fromkeys(name for trace in totals for name in trace))
+    if len(totals) == 1:
+        print(f"{'Stage':<40}{'Wall (ms)':>12}{'CPU (ms)':>12}{'Peak (MB)':>12}")
+        for name in names:
+            t = totals[0][name]
+            print(f"{name:<40}{t['wall_ms']:>12.1f}{t['cpu_ms']:>12.1f}{t['tracemalloc_peak_mb']:>12.2f}")
+    else:
+        print(f"{'Stage':<40}{'Wall before':>12}{'Wall after':>12}{'Change':>9}{'Peak before':>13}{'Peak after':>12}")
+        for name in names:
+            before, after = totals[0].get(name), totals[1].get(name)
+            if before is None or after is None:
+                print(f"{name:<40}  only in the {'new' if before is None else 'baseline'} trace")
+                continue
+            change = (after["wall_ms"] / before["wall_ms"] - 1) * 100 if before["wall_ms"] else 0.0
+            print(f"{name:<40}{before['wall_ms']:>12.1f}{after['wall_ms']:>12.1f}{change:>8.1f}%"
+                  f"{before['tracemalloc_peak_mb']:>13.2f}{after['tracemalloc_peak_mb']:>12.2f}")